@@ -11,7 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 # Import your models and database configuration
 from app.database import Base
 from app.config import settings
-from app.models import Asset, User  # Import all models
+from app.models import Asset, User, DescriptionCache  # Import all models
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,24 @@
+"""Add assets (created_at, id) index for keyset pagination
+
+Revision ID: 3c8d1f0b7a21
+Revises: 971f903129cb
+Create Date: 2026-10-17 09:12:30.418266
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8d1f0b7a21'
+down_revision = '971f903129cb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_assets_created_at_id', 'assets', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assets_created_at_id', table_name='assets')
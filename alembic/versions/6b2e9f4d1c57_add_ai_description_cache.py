@@ -0,0 +1,31 @@
+"""Add AI description cache keyed by image hash
+
+Revision ID: 6b2e9f4d1c57
+Revises: d5f1a7c3e8b4
+Create Date: 2026-10-17 15:42:18.730914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b2e9f4d1c57'
+down_revision = 'd5f1a7c3e8b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_description_cache',
+        sa.Column('image_sha256', sa.String(length=64), nullable=False),
+        sa.Column('prompt_version', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('image_sha256', 'prompt_version')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ai_description_cache')
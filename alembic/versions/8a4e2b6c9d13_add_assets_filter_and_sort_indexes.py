@@ -0,0 +1,34 @@
+"""Add assets filter and sort indexes
+
+Revision ID: 8a4e2b6c9d13
+Revises: 3c8d1f0b7a21
+Create Date: 2026-10-17 10:03:51.772904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e2b6c9d13'
+down_revision = '3c8d1f0b7a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_assets_updated_at_id', 'assets', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_assets_name_id', 'assets', ['name', 'id'], unique=False)
+    op.create_index('ix_assets_purchase_date_id', 'assets', ['purchase_date', 'id'], unique=False)
+    op.create_index('ix_assets_status_created_at_id', 'assets', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_assets_asset_type_created_at_id', 'assets', ['asset_type', 'created_at', 'id'], unique=False)
+    op.create_index('ix_assets_assigned_to_created_at_id', 'assets', ['assigned_to', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assets_assigned_to_created_at_id', table_name='assets')
+    op.drop_index('ix_assets_asset_type_created_at_id', table_name='assets')
+    op.drop_index('ix_assets_status_created_at_id', table_name='assets')
+    op.drop_index('ix_assets_purchase_date_id', table_name='assets')
+    op.drop_index('ix_assets_name_id', table_name='assets')
+    op.drop_index('ix_assets_updated_at_id', table_name='assets')
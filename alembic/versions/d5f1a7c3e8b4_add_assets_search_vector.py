@@ -0,0 +1,40 @@
+"""Add assets full-text search vector
+
+Revision ID: d5f1a7c3e8b4
+Revises: 8a4e2b6c9d13
+Create Date: 2026-10-17 11:20:04.158337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f1a7c3e8b4'
+down_revision = '8a4e2b6c9d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'assets',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(serial_number, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True
+            ),
+            nullable=True
+        )
+    )
+    op.create_index('ix_assets_search_vector', 'assets', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assets_search_vector', table_name='assets', postgresql_using='gin')
+    op.drop_column('assets', 'search_vector')
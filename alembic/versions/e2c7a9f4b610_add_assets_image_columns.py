@@ -0,0 +1,26 @@
+"""Add asset image columns
+
+Revision ID: e2c7a9f4b610
+Revises: 6b2e9f4d1c57
+Create Date: 2026-10-17 18:05:37.412096
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c7a9f4b610'
+down_revision = '6b2e9f4d1c57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('assets', sa.Column('image_sha256', sa.String(length=64), nullable=True))
+    op.add_column('assets', sa.Column('image_content_type', sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('assets', 'image_content_type')
+    op.drop_column('assets', 'image_sha256')
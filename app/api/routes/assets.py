@@ -1,28 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+import asyncio
+import os
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from app.database import get_db
-from app.schemas.asset import AssetCreate, AssetUpdate, AssetResponse
+from app.config import settings
+from app.database import get_db, get_async_db, SessionLocal
+from app.schemas.asset import (
+    AssetCreate,
+    AssetUpdate,
+    AssetResponse,
+    AssetSearchResult,
+    AssetBulkCreate,
+    AssetBulkCreateResponse,
+    BulkItemError,
+    AssetBulkSelection,
+    AssetBulkUpdate,
+    AssetBulkDelete,
+    AssetBulkResult,
+    AssetImportSummary,
+    ImportRowError,
+    AnalysisJob,
+    AnalysisBatchItem,
+    AnalysisBatchResult,
+)
 from app.crud import assets as crud
-from app.cache import get_cache, set_cache, delete_cache, cache_key
+from app.cache import (
+    get_cache_async,
+    read_fence_async,
+    set_fenced_async,
+    set_many,
+    get_or_set_raw,
+    delete_namespaced,
+    delete_namespaced_async,
+    namespace_key,
+    namespace_key_async,
+    namespace_keys,
+    bump_namespace,
+)
 from app.auth import current_active_user
-from app.models.user import User
-from app.services.ai import generate_asset_description
+from app.schemas.user import Principal
+from app.services.ai import get_openai_client
+from app.services.analysis import analysis_jobs, get_job, AnalysisQueueFull
+from app.services.export import iter_ndjson, iter_csv
+from app.services.images import prepare_image, InvalidImage
+from app.services.storage import image_store
+from app.services.importer import iter_lines, iter_assets, InvalidEncoding
+from app.pagination import encode_cursor, decode_cursor, parse_sort, DEFAULT_SORT, SORT_PATTERN
 
 router = APIRouter(prefix="/assets", tags=["assets"])
 
+MISSING_MARKER = "__missing__"
+
+asset_list_adapter = TypeAdapter(List[AssetResponse])
+
 
 @router.post("", response_model=AssetResponse, status_code=status.HTTP_201_CREATED)
 def create_asset(
     asset: AssetCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(current_active_user)
+    current_user: Principal = Depends(current_active_user)
 ):
     try:
         created_asset = crud.create_asset(db=db, asset=asset)
-        from app.cache import invalidate_pattern
-        invalidate_pattern("assets:list*")
+        bump_namespace("assets:list")
         return created_asset
     except ValueError as e:
         raise HTTPException(
@@ -31,41 +76,291 @@ def create_asset(
         )
 
 
+@router.post("/bulk", response_model=AssetBulkCreateResponse)
+def create_assets_bulk(
+    payload: AssetBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(current_active_user)
+):
+    created, errors = crud.create_assets_bulk(db=db, assets=payload.items)
+    created_assets = [AssetResponse.model_validate(row) for row in created]
+    if created_assets:
+        bump_namespace("assets:list")
+        # Warm the per-asset keys in one pipeline; the rows were just written, so they are current.
+        keys = namespace_keys("assets", "asset_id", [asset.id for asset in created_assets])
+        set_many(
+            {key: asset.model_dump(mode='json') for key, asset in zip(keys, created_assets)},
+            ttl=settings.asset_cache_ttl
+        )
+    
+    return AssetBulkCreateResponse(
+        created=created_assets,
+        errors=[
+            BulkItemError(index=index, serial_number=payload.items[index].serial_number, detail=detail)
+            for index, detail in sorted(errors.items())
+        ]
+    )
+
+
+def _bulk_ids(db: Session, payload: AssetBulkSelection) -> List[UUID]:
+    # A filter is resolved to ids up front, so it is held to the same cap as an explicit list.
+    ids = payload.ids
+    if ids is None:
+        ids = crud.matching_asset_ids(db=db, filter=payload.filter, limit=settings.bulk_max_items + 1)
+    if len(ids) > settings.bulk_max_items:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A bulk request may contain at most {settings.bulk_max_items} items"
+        )
+    return ids
+
+
+def _invalidate_assets(asset_ids: List[UUID]) -> None:
+    delete_namespaced("assets", "asset_id", asset_ids, bump=["assets:list"])
+
+
+async def _invalidate_assets_async(asset_ids: List[UUID]) -> None:
+    await delete_namespaced_async("assets", "asset_id", asset_ids, bump=["assets:list"])
+
+
+@router.patch("/bulk", response_model=AssetBulkResult)
+def update_assets_bulk(
+    payload: AssetBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(current_active_user)
+):
+    updated_ids = crud.update_assets_bulk(
+        db=db,
+        changes=payload.changes.model_dump(exclude_unset=True),
+        ids=_bulk_ids(db, payload)
+    )
+    if updated_ids:
+        _invalidate_assets(updated_ids)
+    return AssetBulkResult(count=len(updated_ids), ids=updated_ids)
+
+
+@router.delete("/bulk", response_model=AssetBulkResult)
+def delete_assets_bulk(
+    payload: AssetBulkDelete,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(current_active_user)
+):
+    deleted_ids = crud.delete_assets_bulk(db=db, ids=_bulk_ids(db, payload))
+    if deleted_ids:
+        _invalidate_assets(deleted_ids)
+    return AssetBulkResult(count=len(deleted_ids), ids=deleted_ids)
+
+
+@router.post("/import", response_model=AssetImportSummary)
+async def import_assets(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(current_active_user)
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if content_type.startswith("text/csv") else "ndjson"
+    
+    inserted = 0
+    updated_ids: List[UUID] = []
+    rejected = 0
+    errors: List[ImportRowError] = []
+    chunk: List[AssetCreate] = []
+    chunk_serials = set()
+    
+    async def flush():
+        nonlocal inserted
+        if not chunk:
+            return
+        chunk_inserted, chunk_updated = await crud.upsert_assets_async(db, list(chunk))
+        inserted += chunk_inserted
+        updated_ids.extend(chunk_updated)
+        chunk.clear()
+        chunk_serials.clear()
+    
+    try:
+        lines = iter_lines(request.stream(), settings.import_max_record_bytes)
+        async for line_number, asset, error in iter_assets(lines, format, settings.import_max_record_bytes):
+            if error is not None:
+                rejected += 1
+                if len(errors) < 100:
+                    errors.append(ImportRowError(line=line_number, detail=error))
+                continue
+            # A serial may appear only once per upsert statement.
+            if asset.serial_number in chunk_serials:
+                await flush()
+            chunk.append(asset)
+            chunk_serials.add(asset.serial_number)
+            if len(chunk) >= settings.import_chunk_size:
+                await flush()
+        await flush()
+    except InvalidEncoding as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e}; rows before it may already have been imported"
+        )
+    finally:
+        if inserted or updated_ids:
+            await _invalidate_assets_async(updated_ids)
+    
+    return AssetImportSummary(
+        inserted=inserted,
+        updated=len(updated_ids),
+        rejected=rejected,
+        errors=errors
+    )
+
+
 @router.get("", response_model=List[AssetResponse])
 def list_assets(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(current_active_user)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = None,
+    sort: str = Query(DEFAULT_SORT, pattern=SORT_PATTERN),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    asset_type: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    current_user: Principal = Depends(current_active_user)
 ):
-    cache_key_str = cache_key("assets:list", skip=skip, limit=limit)
+    try:
+        position = decode_cursor(cursor, sort) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    cached_assets = get_cache(cache_key_str)
-    if cached_assets is not None:
-        return [AssetResponse(**asset) for asset in cached_assets]
+    # An empty query value (?status=) means "no filter", for the query and the cache key alike.
+    status_filter = status_filter or None
+    asset_type = asset_type or None
+    assigned_to = assigned_to or None
     
-    assets = crud.get_assets(db=db, skip=skip, limit=limit)
-    assets_response = [AssetResponse.model_validate(asset) for asset in assets]
-    assets_dict = [asset.model_dump(mode='json') for asset in assets_response]
+    cache_key_str = namespace_key(
+        "assets:list",
+        skip=skip,
+        limit=limit,
+        cursor=cursor or "",
+        sort=sort,
+        status=status_filter or "",
+        asset_type=asset_type or "",
+        assigned_to=assigned_to or ""
+    )
     
-    set_cache(cache_key_str, assets_dict, ttl=60)
+    def load_page():
+        # Stale pages are refreshed after the response is sent, so the loader opens
+        # its own session rather than borrowing the request's.
+        db = SessionLocal()
+        try:
+            # Fetch one extra row to learn whether another page exists.
+            assets = crud.get_assets(
+                db=db,
+                skip=skip,
+                limit=limit + 1,
+                cursor=position,
+                sort=sort,
+                status=status_filter,
+                asset_type=asset_type,
+                assigned_to=assigned_to
+            )
+            next_cursor = b""
+            if len(assets) > limit:
+                assets = assets[:limit]
+                sort_field, _ = parse_sort(sort)
+                next_cursor = encode_cursor(sort, getattr(assets[-1], sort_field), assets[-1].id).encode("ascii")
+            body = asset_list_adapter.dump_json(asset_list_adapter.validate_python(assets, from_attributes=True))
+            return next_cursor + b"\n" + body
+        finally:
+            db.close()
     
-    return assets_response
+    # The page is cached as the final response body, so a hit is written out as-is
+    # without rebuilding or re-validating any models.
+    page = get_or_set_raw(
+        cache_key_str,
+        load_page,
+        ttl=settings.list_cache_ttl,
+        stale_ttl=settings.list_cache_stale_ttl
+    )
+    next_cursor, _, body = page.partition(b"\n")
+    headers = {"X-Next-Cursor": next_cursor.decode("ascii")} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/export")
+def export_assets(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: Principal = Depends(current_active_user)
+):
+    # The session lives inside the generator so it stays open for the whole
+    # stream, independent of when request dependencies are torn down.
+    def generate():
+        db = SessionLocal()
+        try:
+            rows = crud.stream_assets(db=db, batch_size=settings.export_batch_size)
+            if format == "csv":
+                yield from iter_csv(rows, [column.key for column in crud.RESPONSE_COLUMNS])
+            else:
+                yield from iter_ndjson(rows)
+        finally:
+            db.close()
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="assets.{format}"'}
+    )
+
+
+@router.get("/search", response_model=List[AssetSearchResult])
+def search_assets(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(current_active_user)
+):
+    results = crud.search_assets(db=db, q=q, limit=limit)
+    return [
+        AssetSearchResult(
+            **AssetResponse.model_validate(asset).model_dump(),
+            rank=rank,
+            snippet=snippet
+        )
+        for asset, rank, snippet in results
+    ]
 
 
 @router.get("/{asset_id}", response_model=AssetResponse)
-def get_asset(
+async def get_asset(
     asset_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(current_active_user)
 ):
-    asset = crud.get_asset(db=db, asset_id=asset_id)
+    cache_key_str = await namespace_key_async("assets", asset_id=str(asset_id))
+    
+    cached_asset = await get_cache_async(cache_key_str)
+    if cached_asset is not None:
+        if cached_asset.get(MISSING_MARKER):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Asset with id {asset_id} not found"
+            )
+        return AssetResponse(**cached_asset)
+    
+    fence = await read_fence_async(cache_key_str)
+    asset = await crud.get_asset_async(db=db, asset_id=asset_id)
     if asset is None:
+        # Remember misses briefly so repeated lookups of unknown ids skip the database.
+        await set_fenced_async(cache_key_str, {MISSING_MARKER: True}, settings.asset_missing_cache_ttl, fence)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Asset with id {asset_id} not found"
         )
-    return asset
+    
+    asset_response = AssetResponse.model_validate(asset)
+    await set_fenced_async(cache_key_str, asset_response.model_dump(mode='json'), settings.asset_cache_ttl, fence)
+    return asset_response
 
 
 @router.put("/{asset_id}", response_model=AssetResponse)
@@ -73,7 +368,7 @@ def update_asset(
     asset_id: UUID,
     asset_update: AssetUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(current_active_user)
+    current_user: Principal = Depends(current_active_user)
 ):
     try:
         asset = crud.update_asset(db=db, asset_id=asset_id, asset_update=asset_update)
@@ -82,9 +377,7 @@ def update_asset(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Asset with id {asset_id} not found"
             )
-        from app.cache import invalidate_pattern
-        invalidate_pattern("assets:list*")
-        delete_cache(cache_key("assets", asset_id=str(asset_id)))
+        _invalidate_assets([asset_id])
         return asset
     except ValueError as e:
         raise HTTPException(
@@ -97,7 +390,7 @@ def update_asset(
 def delete_asset(
     asset_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(current_active_user)
+    current_user: Principal = Depends(current_active_user)
 ):
     success = crud.delete_asset(db=db, asset_id=asset_id)
     if not success:
@@ -105,70 +398,206 @@ def delete_asset(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Asset with id {asset_id} not found"
         )
-    from app.cache import invalidate_pattern
-    invalidate_pattern("assets:list*")
-    delete_cache(cache_key("assets", asset_id=str(asset_id)))
+    _invalidate_assets([asset_id])
+    return None
+
+
+async def _upload_error(file: UploadFile) -> Optional[str]:
+    if not file.content_type or not file.content_type.startswith("image/"):
+        return "File must be an image"
+    # The multipart parser has already spooled the upload to a temporary file.
+    # Scan it a chunk at a time so an oversized file is rejected without ever
+    # being held in memory, then rewind it for the image decoder.
+    size = 0
+    while chunk := await file.read(settings.upload_chunk_size):
+        size += len(chunk)
+        if size > settings.upload_max_bytes:
+            return f"Image file size must be less than {settings.upload_max_bytes // (1024 * 1024)}MB"
+    await file.seek(0)
     return None
 
 
-@router.post("/{asset_id}/upload-image", response_model=AssetResponse)
+@router.post(
+    "/{asset_id}/upload-image",
+    response_model=AnalysisJob,
+    status_code=status.HTTP_202_ACCEPTED
+)
 async def upload_asset_image(
     asset_id: UUID,
+    response: Response,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(current_active_user)
 ):
-    if not file.content_type or not file.content_type.startswith("image/"):
+    error = await _upload_error(file)
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File must be an image"
+            detail=error
         )
     
-    file_contents = await file.read()
-    if len(file_contents) > 10 * 1024 * 1024:
+    asset = await crud.get_asset_async(db=db, asset_id=asset_id)
+    if not asset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Asset with id {asset_id} not found"
+        )
+    
+    # Checked before anything is stored, so a misconfigured server leaves the asset unchanged.
+    try:
+        get_openai_client()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    try:
+        image_data = await asyncio.to_thread(prepare_image, file.file)
+    except InvalidImage as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Image file size must be less than 10MB"
+            detail=str(e)
         )
     
-    asset = crud.get_asset(db=db, asset_id=asset_id)
-    if not asset:
+    await file.seek(0)
+    stored = await asyncio.to_thread(image_store.put, file.file)
+    await crud.set_image_async(db, asset_id, stored.sha256, stored.content_type)
+    await _invalidate_assets_async([asset_id])
+    
+    try:
+        job = await analysis_jobs.submit(asset_id, image_data, "jpeg")
+    except (AnalysisQueueFull, RedisError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+    
+    response.headers["Location"] = f"/assets/{asset_id}/analysis/{job['job_id']}"
+    return AnalysisJob(**job)
+
+
+@router.get("/{asset_id}/image", response_class=FileResponse)
+async def get_asset_image(
+    asset_id: UUID,
+    request: Request,
+    size: str = Query("original", pattern="^(original|thumbnail)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(current_active_user)
+):
+    asset = await crud.get_asset_async(db=db, asset_id=asset_id)
+    if not asset or not asset.image_sha256:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Asset with id {asset_id} not found"
+            detail=f"Asset with id {asset_id} has no image"
         )
     
-    image_format = "png"
-    if file.content_type == "image/jpeg" or file.content_type == "image/jpg":
-        image_format = "jpeg"
-    elif file.content_type == "image/png":
-        image_format = "png"
+    if size == "thumbnail":
+        path = image_store.thumbnail_path(asset.image_sha256)
+        media_type = "image/jpeg"
     else:
-        if file.filename:
-            ext = file.filename.split(".")[-1].lower()
-            if ext in ["jpg", "jpeg"]:
-                image_format = "jpeg"
-            elif ext == "png":
-                image_format = "png"
+        path = image_store.original_path(asset.image_sha256)
+        media_type = asset.image_content_type
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Image for asset {asset_id} is missing from the store"
+        )
     
+    # Stored files are never rewritten, so the ETag FileResponse derives from the
+    # file's mtime and size is stable. The asset can get a new image, so clients
+    # revalidate instead of caching blindly. FileResponse streams the file in
+    # chunks and answers Range and If-Range requests itself.
+    response = FileResponse(
+        path,
+        media_type=media_type,
+        stat_result=stat_result,
+        headers={"Cache-Control": "private, no-cache"}
+    )
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or response.headers["etag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": response.headers["etag"], "Cache-Control": "private, no-cache"}
+        )
+    return response
+
+
+@router.get("/{asset_id}/analysis/{job_id}", response_model=AnalysisJob)
+async def get_analysis_job(
+    asset_id: UUID,
+    job_id: str,
+    current_user: Principal = Depends(current_active_user)
+):
+    job = await get_job(job_id)
+    if job is None or job["asset_id"] != str(asset_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Analysis job {job_id} not found"
+        )
+    return AnalysisJob(**job)
+
+
+@router.post("/analyze-batch", response_model=AnalysisBatchResult)
+async def analyze_assets_batch(
+    asset_ids: List[UUID] = Form(...),
+    files: List[UploadFile] = File(...),
+    current_user: Principal = Depends(current_active_user)
+):
+    if len(asset_ids) != len(files):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide exactly one asset_ids value per file"
+        )
+    if len(files) > settings.analysis_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.analysis_batch_max_items} images"
+        )
     try:
-        description = generate_asset_description(file_contents, image_format)
+        get_openai_client()
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
     
-    asset_update = AssetUpdate(description=description)
-    updated_asset = crud.update_asset(db=db, asset_id=asset_id, asset_update=asset_update)
+    errors: Dict[int, str] = {}
+    for index, file in enumerate(files):
+        error = await _upload_error(file)
+        if error:
+            errors[index] = error
+    pending = [index for index in range(len(files)) if index not in errors]
+    prepared = await asyncio.gather(
+        *(asyncio.to_thread(prepare_image, files[index].file) for index in pending),
+        return_exceptions=True
+    )
+    items: Dict[int, Tuple[UUID, bytes]] = {}
+    for index, image_data in zip(pending, prepared):
+        if isinstance(image_data, InvalidImage):
+            errors[index] = str(image_data)
+        elif isinstance(image_data, BaseException):
+            raise image_data
+        else:
+            items[index] = (asset_ids[index], image_data)
     
-    if not updated_asset:
+    try:
+        results = await analysis_jobs.analyze_batch(items) if items else {}
+    except AnalysisQueueFull as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update asset description"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
         )
     
-    delete_cache("assets:list")
-    delete_cache(cache_key("assets", asset_id=str(asset_id)))
-    
-    return updated_asset
+    batch_items = [
+        AnalysisBatchItem(index=index, asset_id=asset_ids[index], status="failed", error=errors[index])
+        if index in errors
+        else AnalysisBatchItem(index=index, asset_id=asset_ids[index], **results[index])
+        for index in range(len(files))
+    ]
+    succeeded = sum(1 for item in batch_items if item.status == "succeeded")
+    return AnalysisBatchResult(succeeded=succeeded, failed=len(batch_items) - succeeded, items=batch_items)
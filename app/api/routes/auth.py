@@ -1,18 +1,26 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, status, Form
 from fastapi_users import FastAPIUsers
 from fastapi_users.authentication import AuthenticationBackend
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 from app.auth import fastapi_users, auth_backend, get_client_ip, get_jwt_strategy
 from app.services.email import send_ip_change_alert
-from app.crud.users import update_user_ip, get_user_by_email
-from passlib.context import CryptContext
+from app.services.passwords import password_hasher, PasswordPoolSaturated
+from app.crud.users import update_user_ip_async, get_user_by_email_async
 from typing import Optional
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent logins, please retry",
+        headers={"Retry-After": "1"}
+    )
 
 
 @router.post("/login")
@@ -20,16 +28,21 @@ async def login(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = get_user_by_email(db=db, email=username)
+    user = await get_user_by_email_async(db=db, email=username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
-    if not pwd_context.verify(password, user.hashed_password):
+    try:
+        password_valid = await password_hasher.verify(password, user.hashed_password)
+    except PasswordPoolSaturated:
+        raise _password_pool_busy()
+    
+    if not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -56,7 +69,7 @@ async def login(
             old_ip=None
         )
     
-    update_user_ip(db=db, user_id=user.id, ip_address=client_ip)
+    await update_user_ip_async(db=db, user_id=user.id, ip_address=client_ip)
     
     jwt_strategy = get_jwt_strategy()
     token = await jwt_strategy.write_token(user)
@@ -77,6 +90,8 @@ def register(
     try:
         user = create_user(db=db, user_create=user_create)
         return user
+    except PasswordPoolSaturated:
+        raise _password_pool_busy()
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
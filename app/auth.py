@@ -4,10 +4,12 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi_users import FastAPIUsers
 from fastapi_users.authentication import AuthenticationBackend, BearerTransport, JWTStrategy
 from fastapi_users.db import SQLAlchemyUserDatabase
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
-from app.database import get_db
+from app.cache import get_cache_async, set_cache_async
+from app.database import get_async_db
 from app.models.user import User
+from app.schemas.user import Principal
 from app.config import settings
 
 bearer_transport = BearerTransport(tokenUrl="auth/login")
@@ -27,7 +29,7 @@ auth_backend = AuthenticationBackend(
 )
 
 
-def get_user_db(db: Session = Depends(get_db)):
+async def get_user_db(db: AsyncSession = Depends(get_async_db)):
     yield SQLAlchemyUserDatabase(db, User)
 
 
@@ -41,8 +43,8 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     token = credentials.credentials
     
     try:
@@ -64,22 +66,31 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
-    from app.crud.users import get_user_by_id
+    from app.crud.users import get_user_by_id_async, principal_cache_key
     
-    user = get_user_by_id(db, UUID(user_id))
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+    # The session only connects if the principal has to be loaded, so a request
+    # answered from the cache never checks out a database connection.
+    cache_key_str = principal_cache_key(UUID(user_id))
+    cached_principal = await get_cache_async(cache_key_str)
+    if cached_principal is not None:
+        principal = Principal(**cached_principal)
+    else:
+        user = await get_user_by_id_async(db, UUID(user_id))
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        principal = Principal.model_validate(user)
+        await set_cache_async(cache_key_str, principal.model_dump(mode='json'), ttl=settings.principal_cache_ttl)
     
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
         )
     
-    return user
+    return principal
 
 
 current_active_user = get_current_user
@@ -1,15 +1,149 @@
-import json
+import logging
+import sys
+import threading
+import time
+import uuid
 import redis
-from typing import Optional, Any
+import redis.asyncio as aioredis
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional, Any, Callable, Dict, Iterator, List, Sequence, Tuple
 from app.config import settings
+from app.serialization import cache_codec
+from app.metrics import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    CACHE_ERRORS,
+    CACHE_STORED_BYTES,
+    CACHE_EVICTIONS,
+    CACHE_LATENCY,
+    LOCAL_CACHE_BYTES,
+    key_prefix,
+)
+
+logger = logging.getLogger(__name__)
+
+# Both pools are bounded. Callers wait up to redis_pool_timeout for a free
+# connection instead of opening unbounded numbers of them under load.
+_pool_options = dict(
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout,
+    socket_timeout=settings.redis_socket_timeout,
+    socket_connect_timeout=settings.redis_connect_timeout,
+    health_check_interval=30
+)
+
+redis_client = redis.Redis(
+    connection_pool=redis.BlockingConnectionPool.from_url(settings.redis_url, **_pool_options)
+)
 
-redis_client = redis.from_url(
-    settings.redis_url,
-    decode_responses=True,
-    socket_connect_timeout=5
+async_redis_client = aioredis.Redis(
+    connection_pool=aioredis.BlockingConnectionPool.from_url(settings.redis_url, **_pool_options)
 )
 
 
+# Bounded in-process LRU in front of Redis. Entries carry a short TTL and the
+# tier is sized by the approximate bytes held, not by entry count.
+class LocalCache:
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        entry_size = sys.getsizeof(key) + sys.getsizeof(value)
+        if entry_size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + min(ttl or self.ttl, self.ttl)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, value, entry_size)
+            self.size += entry_size
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+                CACHE_EVICTIONS.labels(key_prefix(oldest)).inc()
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+
+local_cache = LocalCache(max_bytes=settings.local_cache_max_bytes, ttl=settings.local_cache_ttl)
+
+# Deletes the lock only if it still holds our token, so a slow holder cannot free someone else's lock.
+_release_lock_script = redis_client.register_script(
+    "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+)
+
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=settings.cache_refresh_workers,
+    thread_name_prefix="cache-refresh"
+)
+
+# Sets a value only while its fence still holds the version the reader saw before loading it.
+_set_if_fence_script = async_redis_client.register_script(
+    "if (redis.call('get', KEYS[2]) or '0') == ARGV[1] then "
+    "return redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3]) end return 0"
+)
+
+_stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+_listener = None
+_listener_wanted = False
+
+
+LOCAL_CACHE_BYTES.set_function(lambda: local_cache.size)
+
+
+def _count(stat: str) -> None:
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+@contextmanager
+def _observe(operation: str, key: str) -> Iterator[None]:
+    prefix = key_prefix(key)
+    started = time.perf_counter()
+    try:
+        yield
+    except redis.RedisError:
+        CACHE_ERRORS.labels(prefix, operation).inc()
+        raise
+    finally:
+        CACHE_LATENCY.labels(prefix, operation).observe(time.perf_counter() - started)
+
+
 def get_redis() -> redis.Redis:
     return redis_client
 
@@ -23,41 +157,478 @@ def cache_key(prefix: str, *args, **kwargs) -> str:
     return ":".join(key_parts)
 
 
+def _local_cache_active() -> bool:
+    # Without a running listener this process would miss invalidations, so the
+    # local tier is bypassed until one is subscribed.
+    return settings.local_cache_enabled and _listener is not None
+
+
+def _get_local(key: str) -> Optional[bytes]:
+    if not _local_cache_active():
+        return None
+    value = local_cache.get(key)
+    if value is not None:
+        _count("local_hits")
+        CACHE_HITS.labels(key_prefix(key), "local").inc()
+    return value
+
+
+def _remember(key: str, value: Optional[bytes]) -> None:
+    if value is None:
+        _count("misses")
+        CACHE_MISSES.labels(key_prefix(key)).inc()
+        return
+    _count("redis_hits")
+    CACHE_HITS.labels(key_prefix(key), "redis").inc()
+    if _local_cache_active():
+        local_cache.set(key, value)
+
+
+def _get_redis(key: str) -> Optional[bytes]:
+    with _observe("get", key):
+        value = redis_client.get(key)
+    _remember(key, value)
+    return value
+
+
+def _get_raw(key: str) -> Optional[bytes]:
+    value = _get_local(key)
+    if value is not None:
+        return value
+    return _get_redis(key)
+
+
+async def _get_raw_async(key: str) -> Optional[bytes]:
+    value = _get_local(key)
+    if value is not None:
+        return value
+    with _observe("get", key):
+        value = await async_redis_client.get(key)
+    _remember(key, value)
+    return value
+
+
+def _get_raw_many(keys: List[str]) -> Tuple[Dict[str, bytes], List[str]]:
+    found = {}
+    missing = []
+    for key in keys:
+        value = _get_local(key)
+        if value is not None:
+            found[key] = value
+        else:
+            missing.append(key)
+    return found, missing
+
+
+def _decode_many(raw: Dict[str, bytes]) -> Dict[str, Any]:
+    values = {}
+    for key, value in raw.items():
+        decoded = _decode(key, value)
+        if decoded is not None:
+            values[key] = decoded
+    return values
+
+
+def _evict_local(keys: List[str]) -> None:
+    for key in keys:
+        local_cache.delete(key)
+
+
+def _handle_invalidation(message: Dict[str, Any]) -> None:
+    for key in message["data"].decode("utf-8").split("\n"):
+        local_cache.delete(key)
+
+
+def _handle_listener_error(error: BaseException, pubsub, thread) -> None:
+    # Invalidations may have been missed while disconnected, so local copies can no longer be trusted.
+    local_cache.clear()
+    time.sleep(1)
+
+
+def _subscribe() -> None:
+    global _listener
+    if not _listener_wanted or _listener is not None:
+        return
+    try:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{settings.cache_invalidation_channel: _handle_invalidation})
+        _listener = pubsub.run_in_thread(
+            sleep_time=1.0,
+            daemon=True,
+            exception_handler=_handle_listener_error
+        )
+    except redis.RedisError:
+        # Keep retrying in the background; the local tier stays off until this succeeds.
+        retry = threading.Timer(1.0, _subscribe)
+        retry.daemon = True
+        retry.start()
+
+
+def start_invalidation_listener() -> None:
+    global _listener_wanted
+    if _listener is not None or not settings.local_cache_enabled:
+        return
+    _listener_wanted = True
+    _subscribe()
+
+
+def stop_invalidation_listener() -> None:
+    global _listener, _listener_wanted
+    _listener_wanted = False
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    local_cache.clear()
+
+
+async def close_async_redis() -> None:
+    # Pooled connections belong to the event loop that opened them.
+    await async_redis_client.connection_pool.disconnect()
+
+
+def cache_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+    redis_lookups = stats["redis_hits"] + stats["misses"]
+    stats["local_hit_ratio"] = stats["local_hits"] / lookups if lookups else 0.0
+    stats["redis_hit_ratio"] = stats["redis_hits"] / redis_lookups if redis_lookups else 0.0
+    stats["local_entries"] = len(local_cache)
+    stats["local_bytes"] = local_cache.size
+    stats["local_max_bytes"] = local_cache.max_bytes
+    stats["local_evictions"] = local_cache.evictions
+    return stats
+
+
+def namespace_generation(namespace: str) -> int:
+    try:
+        value = _get_raw(f"{namespace}:gen")
+        return int(value) if value else 0
+    except (redis.RedisError, ValueError):
+        return 0
+
+
+async def namespace_generation_async(namespace: str) -> int:
+    try:
+        value = await _get_raw_async(f"{namespace}:gen")
+        return int(value) if value else 0
+    except (redis.RedisError, ValueError):
+        return 0
+
+
+def namespace_key(namespace: str, *args, **kwargs) -> str:
+    return cache_key(f"{namespace}:v{namespace_generation(namespace)}", *args, **kwargs)
+
+
+async def namespace_key_async(namespace: str, *args, **kwargs) -> str:
+    return cache_key(f"{namespace}:v{await namespace_generation_async(namespace)}", *args, **kwargs)
+
+
+def namespace_keys(namespace: str, field: str, values: Sequence[Any]) -> List[str]:
+    prefix = f"{namespace}:v{namespace_generation(namespace)}"
+    return [cache_key(prefix, **{field: value}) for value in values]
+
+
+def bump_namespace(namespace: str) -> int:
+    # Entries under the old generation become unreachable and expire on their own TTL.
+    gen_key = f"{namespace}:gen"
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.incr(gen_key)
+        pipe.publish(settings.cache_invalidation_channel, gen_key)
+        with _observe("bump", gen_key):
+            return pipe.execute()[0]
+    except redis.RedisError:
+        return 0
+    finally:
+        _evict_local([gen_key])
+
+
+def _decode(key: str, value: bytes) -> Optional[Any]:
+    try:
+        return cache_codec.loads(value)
+    except ValueError:
+        CACHE_ERRORS.labels(key_prefix(key), "decode").inc()
+        return None
+
+
 def get_cache(key: str) -> Optional[Any]:
     try:
-        value = redis_client.get(key)
-        if value:
-            return json.loads(value)
-    except (redis.RedisError, json.JSONDecodeError):
-        pass
-    return None
+        value = _get_raw(key)
+    except redis.RedisError:
+        return None
+    return _decode(key, value) if value else None
+
+
+async def get_cache_async(key: str) -> Optional[Any]:
+    try:
+        value = await _get_raw_async(key)
+    except redis.RedisError:
+        return None
+    return _decode(key, value) if value else None
+
+
+def get_many(keys: List[str]) -> Dict[str, Any]:
+    # One MGET for everything the local tier does not hold. Missing keys are left out of the result.
+    found, missing = _get_raw_many(keys)
+    if missing:
+        try:
+            with _observe("mget", missing[0]):
+                values = redis_client.mget(missing)
+            for key, value in zip(missing, values):
+                _remember(key, value)
+                if value is not None:
+                    found[key] = value
+        except redis.RedisError:
+            pass
+    return _decode_many(found)
+
+
+async def get_many_async(keys: List[str]) -> Dict[str, Any]:
+    found, missing = _get_raw_many(keys)
+    if missing:
+        try:
+            with _observe("mget", missing[0]):
+                values = await async_redis_client.mget(missing)
+            for key, value in zip(missing, values):
+                _remember(key, value)
+                if value is not None:
+                    found[key] = value
+        except redis.RedisError:
+            pass
+    return _decode_many(found)
 
 
 def set_cache(key: str, value: Any, ttl: int = 60) -> bool:
+    return set_many({key: value}, ttl=ttl)
+
+
+async def set_cache_async(key: str, value: Any, ttl: int = 60) -> bool:
+    return await set_many_async({key: value}, ttl=ttl)
+
+
+def _stored(encoded: Dict[str, bytes], ttl: int) -> None:
+    for key, raw in encoded.items():
+        CACHE_STORED_BYTES.labels(key_prefix(key)).inc(len(raw))
+        if _local_cache_active():
+            local_cache.set(key, raw, ttl)
+
+
+def set_many(values: Dict[str, Any], ttl: int = 60) -> bool:
+    if not values:
+        return True
     try:
-        redis_client.setex(
-            key,
-            ttl,
-            json.dumps(value, default=str)
-        )
+        encoded = {key: cache_codec.dumps(value) for key, value in values.items()}
+        pipe = redis_client.pipeline(transaction=False)
+        for key, raw in encoded.items():
+            pipe.setex(key, ttl, raw)
+        with _observe("set", next(iter(encoded))):
+            pipe.execute()
+        _stored(encoded, ttl)
+        return True
+    except (redis.RedisError, TypeError):
+        return False
+
+
+async def set_many_async(values: Dict[str, Any], ttl: int = 60) -> bool:
+    if not values:
         return True
+    try:
+        encoded = {key: cache_codec.dumps(value) for key, value in values.items()}
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            for key, raw in encoded.items():
+                pipe.setex(key, ttl, raw)
+            with _observe("set", next(iter(encoded))):
+                await pipe.execute()
+        _stored(encoded, ttl)
+        return True
+    except (redis.RedisError, TypeError):
+        return False
+
+
+def _fence_key(key: str) -> str:
+    return f"fence:{key}"
+
+
+async def read_fence_async(key: str) -> Optional[bytes]:
+    # Read before loading a value from the database, then handed to set_fenced_async.
+    try:
+        with _observe("get", _fence_key(key)):
+            return await async_redis_client.get(_fence_key(key)) or b"0"
+    except redis.RedisError:
+        return None
+
+
+async def set_fenced_async(key: str, value: Any, ttl: int, fence: Optional[bytes]) -> bool:
+    # A fenced delete of the key since the fence was read skips the write, so a slow
+    # reader cannot put back a row that a concurrent write has already replaced.
+    if fence is None:
+        return False
+    try:
+        raw = cache_codec.dumps(value)
+        with _observe("set", key):
+            stored = await _set_if_fence_script(keys=[key, _fence_key(key)], args=[fence, raw, ttl])
+        if stored:
+            _stored({key: raw}, ttl)
+        return bool(stored)
     except (redis.RedisError, TypeError):
         return False
 
 
 def delete_cache(key: str) -> bool:
+    return delete_many([key])
+
+
+def _queue_deletes(pipe, keys: List[str], gen_keys: List[str], fence: bool) -> None:
+    # Namespace bumps ride in the same pipeline, so a write invalidates everything in one round trip.
+    for gen_key in gen_keys:
+        pipe.incr(gen_key)
+    for key in keys:
+        pipe.delete(key)
+        if fence:
+            pipe.incr(_fence_key(key))
+            pipe.expire(_fence_key(key), settings.cache_fence_ttl)
+    pipe.publish(settings.cache_invalidation_channel, "\n".join(gen_keys + keys))
+
+
+def delete_many(keys: List[str], bump: Sequence[str] = (), fence: bool = False) -> bool:
+    gen_keys = [f"{namespace}:gen" for namespace in bump]
+    if not keys and not gen_keys:
+        return True
     try:
-        redis_client.delete(key)
+        pipe = redis_client.pipeline(transaction=False)
+        _queue_deletes(pipe, keys, gen_keys, fence)
+        with _observe("delete", (gen_keys + keys)[0]):
+            pipe.execute()
         return True
     except redis.RedisError:
         return False
+    finally:
+        _evict_local(gen_keys + keys)
 
 
-def invalidate_pattern(pattern: str) -> int:
+async def delete_many_async(keys: List[str], bump: Sequence[str] = (), fence: bool = False) -> bool:
+    gen_keys = [f"{namespace}:gen" for namespace in bump]
+    if not keys and not gen_keys:
+        return True
     try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            return redis_client.delete(*keys)
-        return 0
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            _queue_deletes(pipe, keys, gen_keys, fence)
+            with _observe("delete", (gen_keys + keys)[0]):
+                await pipe.execute()
+        return True
     except redis.RedisError:
-        return 0
+        return False
+    finally:
+        _evict_local(gen_keys + keys)
+
+
+def delete_namespaced(namespace: str, field: str, values: Sequence[Any], bump: Sequence[str] = ()) -> bool:
+    # Past the threshold one INCR of the generation is cheaper than a DEL and a
+    # published key per entry; the orphaned entries expire on their own TTL. Either
+    # way a reader that loaded the old row cannot store it where readers will look.
+    if len(values) > settings.cache_bump_threshold:
+        return delete_many([], bump=[namespace, *bump])
+    return delete_many(namespace_keys(namespace, field, values), bump=bump, fence=True)
+
+
+async def delete_namespaced_async(namespace: str, field: str, values: Sequence[Any], bump: Sequence[str] = ()) -> bool:
+    if len(values) > settings.cache_bump_threshold:
+        return await delete_many_async([], bump=[namespace, *bump])
+    prefix = f"{namespace}:v{await namespace_generation_async(namespace)}"
+    return await delete_many_async([cache_key(prefix, **{field: value}) for value in values], bump=bump, fence=True)
+
+
+def _acquire_lock(key: str) -> Optional[str]:
+    # None means another caller holds the lock; Redis errors propagate so the
+    # caller can tell an outage apart from contention.
+    token = uuid.uuid4().hex
+    if redis_client.set(f"lock:{key}", token, nx=True, px=settings.cache_lock_ttl_ms):
+        return token
+    return None
+
+
+def _release_lock(key: str, token: str) -> None:
+    try:
+        _release_lock_script(keys=[f"lock:{key}"], args=[token])
+    except redis.RedisError:
+        pass
+
+
+def _parse_envelope(raw: Optional[bytes]) -> Optional[Tuple[float, bytes]]:
+    # Envelopes are b"<fresh_until>\n<payload>", so a hit never has to decode the payload itself.
+    if not raw:
+        return None
+    fresh_until, _, payload = raw.partition(b"\n")
+    try:
+        return float(fresh_until), payload
+    except ValueError:
+        return None
+
+
+def _compute_and_store(key: str, loader: Callable[[], bytes], ttl: int, stale_ttl: int) -> bytes:
+    payload = loader()
+    raw = b"%f\n%b" % (time.time() + ttl, payload)
+    try:
+        with _observe("set", key):
+            redis_client.setex(key, ttl + stale_ttl, raw)
+        _stored({key: raw}, ttl + stale_ttl)
+    except redis.RedisError:
+        pass
+    return payload
+
+
+def _refresh(key: str, loader: Callable[[], bytes], ttl: int, stale_ttl: int, token: str) -> None:
+    try:
+        _compute_and_store(key, loader, ttl, stale_ttl)
+    except Exception:
+        logger.exception("Background refresh of %s failed", key)
+    finally:
+        _release_lock(key, token)
+
+
+def get_or_set_raw(key: str, loader: Callable[[], bytes], ttl: int = 60, stale_ttl: int = 0) -> bytes:
+    # Values are fresh for ttl seconds, then served stale for up to stale_ttl more while
+    # a single caller, the one holding the lock, recomputes them in the background.
+    # The loader may run on another thread, so it must not use request-scoped state.
+    envelope = _parse_envelope(_get_local(key))
+    if envelope is not None and envelope[0] > time.time():
+        return envelope[1]
+    try:
+        # A stale local copy may predate a refresh another worker already stored,
+        # so Redis decides whether this key still needs one.
+        envelope = _parse_envelope(_get_redis(key))
+        if envelope is not None and envelope[0] > time.time():
+            return envelope[1]
+        token = _acquire_lock(key)
+    except redis.RedisError:
+        # With Redis down there is no lock to wait on and nowhere to store the result.
+        return loader()
+    
+    if envelope is not None:
+        if token is not None:
+            _refresh_executor.submit(_refresh, key, loader, ttl, stale_ttl, token)
+        return envelope[1]
+    
+    if token is not None:
+        try:
+            return _compute_and_store(key, loader, ttl, stale_ttl)
+        finally:
+            _release_lock(key, token)
+    
+    # Someone else is computing a missing key: wait briefly for their result.
+    deadline = time.monotonic() + settings.cache_lock_wait_ms / 1000
+    while time.monotonic() < deadline:
+        time.sleep(0.02)
+        try:
+            envelope = _parse_envelope(_get_redis(key))
+        except redis.RedisError:
+            break
+        if envelope is not None:
+            return envelope[1]
+    return _compute_and_store(key, loader, ttl, stale_ttl)
+
+
+def get_or_set(key: str, loader: Callable[[], Any], ttl: int = 60, stale_ttl: int = 0) -> Any:
+    payload = get_or_set_raw(key, lambda: cache_codec.dumps(loader()), ttl=ttl, stale_ttl=stale_ttl)
+    return cache_codec.loads(payload)
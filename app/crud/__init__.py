@@ -1,3 +1,21 @@
-from app.crud.assets import get_asset, get_assets, create_asset, update_asset, delete_asset
+from app.crud.assets import (
+    get_asset,
+    get_assets,
+    create_asset,
+    update_asset,
+    delete_asset,
+    get_asset_async,
+    get_assets_async,
+    update_asset_async,
+)
 
-__all__ = ["get_asset", "get_assets", "create_asset", "update_asset", "delete_asset"]
+__all__ = [
+    "get_asset",
+    "get_assets",
+    "create_asset",
+    "update_asset",
+    "delete_asset",
+    "get_asset_async",
+    "get_assets_async",
+    "update_asset_async",
+]
@@ -1,17 +1,281 @@
+from sqlalchemy import and_, or_, tuple_, func, select, update, delete, literal_column, column, values, cast, Text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from uuid import UUID
-from typing import List, Optional
+from sqlalchemy.sql import Select
+from uuid import UUID, uuid4
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 from app.models.asset import Asset
-from app.schemas.asset import AssetCreate, AssetUpdate
+from app.schemas.asset import AssetCreate, AssetUpdate, AssetFilter
+from app.pagination import DEFAULT_SORT, parse_sort
+
+# Every column except the search vector, for statements that return plain rows.
+RESPONSE_COLUMNS = [column for column in Asset.__table__.c if column.key != "search_vector"]
+DEFAULTED_FIELDS = frozenset(
+    name for name, field in AssetCreate.model_fields.items()
+    if not field.is_required() and field.default is not None
+)
+
+# Statements are built once here and executed by both the sync and the async functions below.
+
+
+def filter_clauses(
+    status: Optional[str] = None,
+    asset_type: Optional[str] = None,
+    assigned_to: Optional[str] = None
+) -> List[Any]:
+    clauses = []
+    if status is not None:
+        clauses.append(Asset.status == status)
+    if asset_type is not None:
+        clauses.append(Asset.asset_type == asset_type)
+    if assigned_to is not None:
+        clauses.append(Asset.assigned_to == assigned_to)
+    return clauses
+
+
+def _after_cursor(field: str, descending: bool, cursor: Tuple[Any, UUID]):
+    # Postgres sorts NULLs last ascending and first descending, which matches
+    # a forward or backward scan of the (column, id) index.
+    column = getattr(Asset, field)
+    value, asset_id = cursor
+    if value is None:
+        if descending:
+            return or_(and_(column.is_(None), Asset.id < asset_id), column.isnot(None))
+        return and_(column.is_(None), Asset.id > asset_id)
+    if descending:
+        return tuple_(column, Asset.id) < (value, asset_id)
+    if Asset.__table__.c[field].nullable:
+        return or_(tuple_(column, Asset.id) > (value, asset_id), column.is_(None))
+    return tuple_(column, Asset.id) > (value, asset_id)
+
+
+def _get_statement(asset_id: UUID) -> Select:
+    return select(Asset).where(Asset.id == asset_id)
+
+
+def _list_statement(
+    skip: int,
+    limit: int,
+    cursor: Optional[Tuple[Any, UUID]],
+    sort: str,
+    status: Optional[str],
+    asset_type: Optional[str],
+    assigned_to: Optional[str]
+) -> Select:
+    field, descending = parse_sort(sort)
+    column = getattr(Asset, field)
+    
+    stmt = select(Asset).where(*filter_clauses(status=status, asset_type=asset_type, assigned_to=assigned_to))
+    if descending:
+        stmt = stmt.order_by(column.desc(), Asset.id.desc())
+    else:
+        stmt = stmt.order_by(column.asc(), Asset.id.asc())
+    if cursor is not None:
+        stmt = stmt.where(_after_cursor(field, descending, cursor))
+    return stmt.offset(skip).limit(limit)
+
+
+def _stream_statement(batch_size: int) -> Select:
+    # yield_per switches to a server-side cursor, so rows arrive batch by batch.
+    return (
+        select(*RESPONSE_COLUMNS)
+        .order_by(Asset.created_at, Asset.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+_HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;"))
+
+
+def _html_escape(text):
+    # "&" goes first so the entities added by the later replacements survive.
+    for char, entity in _HTML_ESCAPES:
+        text = func.replace(text, char, entity)
+    return text
+
+
+def _search_statement(q: str, limit: int) -> Select:
+    # Parse the query with both configs so serial numbers match unstemmed.
+    ts_query = func.websearch_to_tsquery("english", q).op("||")(func.websearch_to_tsquery("simple", q))
+    ranked = (
+        select(Asset.id, func.ts_rank_cd(Asset.search_vector, ts_query).label("rank"))
+        .where(Asset.search_vector.bool_op("@@")(ts_query))
+        .order_by(func.ts_rank_cd(Asset.search_vector, ts_query).desc())
+        .limit(limit)
+        .subquery()
+    )
+    # Highlighting is expensive, so it only runs on the rows that made the cut. The
+    # source is escaped first, so the <b> markers are the only markup in a snippet.
+    snippet = func.ts_headline(
+        "english",
+        _html_escape(func.coalesce(Asset.description, Asset.name)),
+        ts_query,
+        "StartSel=<b>, StopSel=</b>, MaxWords=35, MinWords=15, MaxFragments=2"
+    )
+    return (
+        select(Asset, ranked.c.rank, snippet.label("snippet"))
+        .join(ranked, Asset.id == ranked.c.id)
+        .order_by(ranked.c.rank.desc(), Asset.id)
+    )
+
+
+def _bulk_insert_rows(assets: List[AssetCreate]) -> Tuple[List[Dict[str, Any]], Dict[str, int], Dict[int, str]]:
+    errors: Dict[int, str] = {}
+    pending: Dict[str, int] = {}
+    rows = []
+    for index, asset in enumerate(assets):
+        if asset.serial_number in pending:
+            errors[index] = f"Duplicate serial number {asset.serial_number} in batch"
+            continue
+        pending[asset.serial_number] = index
+        rows.append({"id": uuid4(), **asset.model_dump()})
+    return rows, pending, errors
+
+
+def _bulk_insert_statement(rows: List[Dict[str, Any]]):
+    # One multi-row INSERT; rows whose serial already exists are skipped rather than failing the batch.
+    return (
+        insert(Asset.__table__)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["serial_number"])
+        .returning(*RESPONSE_COLUMNS)
+    )
+
+
+def _bulk_insert_result(
+    inserted: List[Row],
+    pending: Dict[str, int],
+    errors: Dict[int, str]
+) -> Tuple[List[Row], Dict[int, str]]:
+    created_serials = {row.serial_number for row in inserted}
+    for serial_number, index in pending.items():
+        if serial_number not in created_serials:
+            errors[index] = f"Asset with serial number {serial_number} already exists"
+    
+    inserted.sort(key=lambda row: pending[row.serial_number])
+    return inserted, errors
+
+
+def _upsert_statement(assets: List[AssetCreate], keep: FrozenSet[str]):
+    rows = [{"id": uuid4(), **asset.model_dump()} for asset in assets]
+    stmt = insert(Asset.__table__).values(rows)
+    # Blank optional fields in an import never erase data already on the asset,
+    # and fields left at their default (keep) never overwrite it either.
+    return stmt.on_conflict_do_update(
+        index_elements=["serial_number"],
+        set_={
+            **{
+                key: func.coalesce(stmt.excluded[key], Asset.__table__.c[key])
+                for key in AssetCreate.model_fields
+                if key != "serial_number" and key not in keep
+            },
+            "updated_at": func.now(),
+        }
+    ).returning(Asset.id, literal_column("xmax = 0").label("inserted"))
+
+
+def _upsert_statements(assets: List[AssetCreate]) -> List[Any]:
+    # A defaulted field (e.g. status="active") is needed for inserts but must not
+    # reset an existing asset, so rows are grouped by which defaults they left unset.
+    groups: Dict[FrozenSet[str], List[AssetCreate]] = {}
+    for asset in assets:
+        keep = frozenset(DEFAULTED_FIELDS - asset.model_fields_set)
+        groups.setdefault(keep, []).append(asset)
+    return [_upsert_statement(group, keep) for keep, group in groups.items()]
+
+
+def _upsert_result(results: List[Row]) -> Tuple[int, List[UUID]]:
+    inserted = sum(1 for row in results if row.inserted)
+    updated_ids = [row.id for row in results if not row.inserted]
+    return inserted, updated_ids
+
+
+def _selection_clauses(ids: Optional[List[UUID]], filter: Optional[AssetFilter]) -> List[Any]:
+    if ids is not None:
+        return [Asset.id.in_(ids)]
+    return filter_clauses(**filter.model_dump())
+
+
+def _matching_ids_statement(filter: AssetFilter, limit: int):
+    # FOR UPDATE holds the matched rows until the bulk statement commits, so it touches exactly these.
+    return (
+        select(Asset.id)
+        .where(*filter_clauses(**filter.model_dump()))
+        .limit(limit)
+        .with_for_update()
+    )
+
+
+def _bulk_update_statement(changes: Dict[str, Any], ids: Optional[List[UUID]], filter: Optional[AssetFilter]):
+    return (
+        update(Asset.__table__)
+        .where(*_selection_clauses(ids, filter))
+        .values(**changes)
+        .returning(Asset.id)
+    )
+
+
+def _bulk_delete_statement(ids: Optional[List[UUID]], filter: Optional[AssetFilter]):
+    return delete(Asset.__table__).where(*_selection_clauses(ids, filter)).returning(Asset.id)
+
+
+def _existing_ids_statement(ids: Iterable[UUID]):
+    return select(Asset.id).where(Asset.id.in_(list(ids)))
+
+
+def _set_descriptions_statement(descriptions: Dict[UUID, str]):
+    # One UPDATE ... FROM (VALUES ...) writes every description in a single statement.
+    # Ids travel as text and are cast back, because VALUES columns get no type
+    # from the driver.
+    rows = values(
+        column("id", Text),
+        column("description", Text),
+        name="new_descriptions"
+    ).data([(str(asset_id), description) for asset_id, description in descriptions.items()])
+    return (
+        update(Asset.__table__)
+        .where(Asset.id == cast(rows.c.id, PG_UUID(as_uuid=True)))
+        .values(description=rows.c.description)
+        .returning(Asset.id)
+    )
+
+
+def _set_image_statement(asset_id: UUID, image_sha256: str, image_content_type: str):
+    return (
+        update(Asset.__table__)
+        .where(Asset.id == asset_id)
+        .values(image_sha256=image_sha256, image_content_type=image_content_type)
+    )
 
 
 def get_asset(db: Session, asset_id: UUID) -> Optional[Asset]:
-    return db.query(Asset).filter(Asset.id == asset_id).first()
+    return db.scalars(_get_statement(asset_id)).first()
+
+
+def get_assets(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Tuple[Any, UUID]] = None,
+    sort: str = DEFAULT_SORT,
+    status: Optional[str] = None,
+    asset_type: Optional[str] = None,
+    assigned_to: Optional[str] = None
+) -> List[Asset]:
+    stmt = _list_statement(skip, limit, cursor, sort, status, asset_type, assigned_to)
+    return list(db.scalars(stmt).all())
+
+
+def stream_assets(db: Session, batch_size: int = 1000) -> Iterator[Row]:
+    yield from db.execute(_stream_statement(batch_size))
 
 
-def get_assets(db: Session, skip: int = 0, limit: int = 100) -> List[Asset]:
-    return db.query(Asset).offset(skip).limit(limit).all()
+def search_assets(db: Session, q: str, limit: int = 20) -> List[Tuple[Asset, float, Optional[str]]]:
+    return [tuple(row) for row in db.execute(_search_statement(q, limit)).all()]
 
 
 def create_asset(db: Session, asset: AssetCreate) -> Asset:
@@ -26,6 +290,44 @@ def create_asset(db: Session, asset: AssetCreate) -> Asset:
         raise ValueError(f"Asset with serial number {asset.serial_number} already exists")
 
 
+def create_assets_bulk(
+    db: Session,
+    assets: List[AssetCreate]
+) -> Tuple[List[Row], Dict[int, str]]:
+    rows, pending, errors = _bulk_insert_rows(assets)
+    if not rows:
+        return [], errors
+    
+    inserted = db.execute(_bulk_insert_statement(rows)).all()
+    db.commit()
+    return _bulk_insert_result(inserted, pending, errors)
+
+
+def matching_asset_ids(db: Session, filter: AssetFilter, limit: int) -> List[UUID]:
+    return list(db.scalars(_matching_ids_statement(filter, limit)).all())
+
+
+def update_assets_bulk(
+    db: Session,
+    changes: Dict[str, Any],
+    ids: Optional[List[UUID]] = None,
+    filter: Optional[AssetFilter] = None
+) -> List[UUID]:
+    updated_ids = list(db.scalars(_bulk_update_statement(changes, ids, filter)).all())
+    db.commit()
+    return updated_ids
+
+
+def delete_assets_bulk(
+    db: Session,
+    ids: Optional[List[UUID]] = None,
+    filter: Optional[AssetFilter] = None
+) -> List[UUID]:
+    deleted_ids = list(db.scalars(_bulk_delete_statement(ids, filter)).all())
+    db.commit()
+    return deleted_ids
+
+
 def update_asset(db: Session, asset_id: UUID, asset_update: AssetUpdate) -> Optional[Asset]:
     db_asset = get_asset(db, asset_id)
     if not db_asset:
@@ -52,3 +354,64 @@ def delete_asset(db: Session, asset_id: UUID) -> bool:
     db.delete(db_asset)
     db.commit()
     return True
+
+
+async def get_asset_async(db: AsyncSession, asset_id: UUID) -> Optional[Asset]:
+    return (await db.scalars(_get_statement(asset_id))).first()
+
+
+async def get_assets_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Tuple[Any, UUID]] = None,
+    sort: str = DEFAULT_SORT,
+    status: Optional[str] = None,
+    asset_type: Optional[str] = None,
+    assigned_to: Optional[str] = None
+) -> List[Asset]:
+    stmt = _list_statement(skip, limit, cursor, sort, status, asset_type, assigned_to)
+    return list((await db.scalars(stmt)).all())
+
+
+async def upsert_assets_async(db: AsyncSession, assets: List[AssetCreate]) -> Tuple[int, List[UUID]]:
+    results = []
+    for stmt in _upsert_statements(assets):
+        results.extend((await db.execute(stmt)).all())
+    await db.commit()
+    return _upsert_result(results)
+
+
+async def existing_asset_ids_async(db: AsyncSession, ids: Iterable[UUID]) -> Set[UUID]:
+    return set((await db.scalars(_existing_ids_statement(ids))).all())
+
+
+async def set_descriptions_async(db: AsyncSession, descriptions: Dict[UUID, str]) -> List[UUID]:
+    if not descriptions:
+        return []
+    updated_ids = list((await db.scalars(_set_descriptions_statement(descriptions))).all())
+    await db.commit()
+    return updated_ids
+
+
+async def set_image_async(db: AsyncSession, asset_id: UUID, image_sha256: str, image_content_type: str) -> None:
+    await db.execute(_set_image_statement(asset_id, image_sha256, image_content_type))
+    await db.commit()
+
+
+async def update_asset_async(db: AsyncSession, asset_id: UUID, asset_update: AssetUpdate) -> Optional[Asset]:
+    db_asset = await get_asset_async(db, asset_id)
+    if not db_asset:
+        return None
+    
+    update_data = asset_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_asset, field, value)
+    
+    try:
+        await db.commit()
+        await db.refresh(db_asset)
+        return db_asset
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError(f"Serial number {update_data.get('serial_number')} already exists")
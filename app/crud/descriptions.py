@@ -0,0 +1,49 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, Optional
+from app.models.description_cache import DescriptionCache
+
+
+def _get_statement(image_sha256: str, prompt_version: str):
+    return select(DescriptionCache.description).where(
+        DescriptionCache.image_sha256 == image_sha256,
+        DescriptionCache.prompt_version == prompt_version
+    )
+
+
+def _get_many_statement(image_sha256s: Iterable[str], prompt_version: str):
+    return select(DescriptionCache.image_sha256, DescriptionCache.description).where(
+        DescriptionCache.image_sha256.in_(list(image_sha256s)),
+        DescriptionCache.prompt_version == prompt_version
+    )
+
+
+def _store_statement(descriptions: Dict[str, str], prompt_version: str):
+    # Two uploads of the same image may race to store it; the first one wins.
+    return insert(DescriptionCache).values([
+        {"image_sha256": image_sha256, "prompt_version": prompt_version, "description": description}
+        for image_sha256, description in descriptions.items()
+    ]).on_conflict_do_nothing(index_elements=["image_sha256", "prompt_version"])
+
+
+async def get_cached_description_async(db: AsyncSession, image_sha256: str, prompt_version: str) -> Optional[str]:
+    return await db.scalar(_get_statement(image_sha256, prompt_version))
+
+
+async def get_cached_descriptions_async(
+    db: AsyncSession,
+    image_sha256s: Iterable[str],
+    prompt_version: str
+) -> Dict[str, str]:
+    return dict((await db.execute(_get_many_statement(image_sha256s, prompt_version))).all())
+
+
+async def store_description_async(db: AsyncSession, image_sha256: str, prompt_version: str, description: str) -> None:
+    await store_descriptions_async(db, {image_sha256: description}, prompt_version)
+
+
+async def store_descriptions_async(db: AsyncSession, descriptions: Dict[str, str], prompt_version: str) -> None:
+    if descriptions:
+        await db.execute(_store_statement(descriptions, prompt_version))
+        await db.commit()
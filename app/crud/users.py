@@ -1,20 +1,25 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from uuid import UUID
 from typing import Optional
-from passlib.context import CryptContext
+from app.cache import cache_key, delete_cache
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.services.passwords import password_hasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def principal_cache_key(user_id: UUID) -> str:
+    return cache_key("principals", user_id=str(user_id))
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+    return db.scalars(select(User).where(User.email == email)).first()
 
 
 def get_user_by_id(db: Session, user_id: UUID) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+    return db.scalars(select(User).where(User.id == user_id)).first()
 
 
 def create_user(db: Session, user_create: UserCreate) -> User:
@@ -22,7 +27,7 @@ def create_user(db: Session, user_create: UserCreate) -> User:
     if existing_user:
         raise ValueError(f"User with email {user_create.email} already exists")
     
-    hashed_password = pwd_context.hash(user_create.password)
+    hashed_password = password_hasher.hash_sync(user_create.password)
     
     db_user = User(
         email=user_create.email,
@@ -48,3 +53,35 @@ def update_user_ip(db: Session, user_id: UUID, ip_address: str) -> Optional[User
     db.commit()
     db.refresh(db_user)
     return db_user
+
+
+def set_user_active(db: Session, user_id: UUID, is_active: bool) -> Optional[User]:
+    db_user = get_user_by_id(db, user_id)
+    if not db_user:
+        return None
+    
+    db_user.is_active = is_active
+    db.commit()
+    db.refresh(db_user)
+    # Cached principals would otherwise keep a deactivated user signed in until they expire.
+    delete_cache(principal_cache_key(user_id))
+    return db_user
+
+
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    return (await db.scalars(select(User).where(User.email == email))).first()
+
+
+async def get_user_by_id_async(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    return (await db.scalars(select(User).where(User.id == user_id))).first()
+
+
+async def update_user_ip_async(db: AsyncSession, user_id: UUID, ip_address: str) -> Optional[User]:
+    db_user = await get_user_by_id_async(db, user_id)
+    if not db_user:
+        return None
+    
+    db_user.last_login_ip = ip_address
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
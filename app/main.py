@@ -1,13 +1,35 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.api.routes import assets, auth
+from app.cache import start_invalidation_listener, stop_invalidation_listener, close_async_redis, cache_stats
+from app.config import settings
 from app.database import engine, Base
+from app.serialization import get_response_class
+from app.services.analysis import analysis_jobs, analysis_stats
+from app.services.email import email_dispatcher
 
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_invalidation_listener()
+    email_dispatcher.start()
+    await analysis_jobs.start()
+    yield
+    await analysis_jobs.stop()
+    email_dispatcher.stop()
+    stop_invalidation_listener()
+    await close_async_redis()
+
+
 app = FastAPI(
     title="Asset Management API",
     description="API for managing company digital assets",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=get_response_class(settings.response_codec)
 )
 
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -24,6 +46,16 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/cache/stats")
+def get_cache_stats():
+    return {**cache_stats(), "ai_descriptions": analysis_stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.post("/test-email")
 def test_email(
     to_email: str,
@@ -0,0 +1,74 @@
+import re
+from prometheus_client import Counter, Gauge, Histogram
+
+# Cache metrics are labelled by key prefix: the first two segments of the key once
+# any namespace generation ("v7") is dropped, e.g. "assets:list" or "assets:asset_id",
+# so a bump never starts a new series. Everything is recorded in-process.
+CACHE_HITS = Counter(
+    "cache_hits_total",
+    "Cache lookups answered from a cache tier",
+    ["prefix", "tier"]
+)
+CACHE_MISSES = Counter(
+    "cache_misses_total",
+    "Cache lookups found in neither tier",
+    ["prefix"]
+)
+CACHE_ERRORS = Counter(
+    "cache_errors_total",
+    "Redis errors and undecodable values, by operation",
+    ["prefix", "operation"]
+)
+CACHE_STORED_BYTES = Counter(
+    "cache_stored_bytes_total",
+    "Encoded bytes written to Redis",
+    ["prefix"]
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entries evicted from the in-process tier to stay under its byte ceiling",
+    ["prefix"]
+)
+CACHE_LATENCY = Histogram(
+    "cache_operation_seconds",
+    "Latency of Redis cache operations",
+    ["prefix", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+LOCAL_CACHE_BYTES = Gauge(
+    "cache_local_bytes",
+    "Approximate bytes held by the in-process tier"
+)
+
+EMAIL_QUEUE_DEPTH = Gauge(
+    "email_queue_depth",
+    "Messages waiting for the email dispatcher"
+)
+EMAILS_SENT = Counter(
+    "emails_sent_total",
+    "Messages accepted by the SMTP server"
+)
+EMAILS_FAILED = Counter(
+    "emails_failed_total",
+    "Messages dropped because the queue was full, the recipient was refused or retries ran out"
+)
+
+AI_DEDUP_HITS = Counter(
+    "ai_description_dedup_hits_total",
+    "Image uploads answered from the description cache without a model call"
+)
+AI_DEDUP_MISSES = Counter(
+    "ai_description_dedup_misses_total",
+    "Image uploads that needed a model call"
+)
+AI_CIRCUIT_OPEN = Gauge(
+    "ai_circuit_open",
+    "1 while the circuit breaker in front of the vision model is open"
+)
+
+
+_GENERATION_SEGMENT = re.compile(r":v\d+(?=:|$)")
+
+
+def key_prefix(key: str) -> str:
+    return ":".join(_GENERATION_SEGMENT.sub("", key, count=1).split(":", 2)[:2])
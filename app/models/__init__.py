@@ -1,4 +1,5 @@
 from app.models.asset import Asset
 from app.models.user import User
+from app.models.description_cache import DescriptionCache
 
-__all__ = ["Asset", "User"]
+__all__ = ["Asset", "User", "DescriptionCache"]
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, Date, Numeric, Text, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Date, Numeric, Text, DateTime, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 import uuid
 from app.database import Base
@@ -7,6 +8,16 @@ from app.database import Base
 
 class Asset(Base):
     __tablename__ = "assets"
+    __table_args__ = (
+        Index("ix_assets_created_at_id", "created_at", "id"),
+        Index("ix_assets_updated_at_id", "updated_at", "id"),
+        Index("ix_assets_name_id", "name", "id"),
+        Index("ix_assets_purchase_date_id", "purchase_date", "id"),
+        Index("ix_assets_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_assets_asset_type_created_at_id", "asset_type", "created_at", "id"),
+        Index("ix_assets_assigned_to_created_at_id", "assigned_to", "created_at", "id"),
+        Index("ix_assets_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     name = Column(String(255), nullable=False)
@@ -17,8 +28,21 @@ class Asset(Base):
     purchase_date = Column(Date, nullable=True)
     purchase_price = Column(Numeric(10, 2), nullable=True)
     description = Column(Text, nullable=True)
+    # SHA-256 of the original upload, which is also its name in the image store.
+    image_sha256 = Column(String(64), nullable=True)
+    image_content_type = Column(String(100), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Maintained by Postgres on every write; serials use the 'simple' config so they are not stemmed.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(serial_number, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
 
     def __repr__(self):
         return f"<Asset(id={self.id}, name={self.name}, type={self.asset_type})>"
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class DescriptionCache(Base):
+    __tablename__ = "ai_description_cache"
+
+    image_sha256 = Column(String(64), primary_key=True)
+    prompt_version = Column(String(100), primary_key=True)
+    description = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<DescriptionCache(image_sha256={self.image_sha256}, prompt_version={self.prompt_version})>"
@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Tuple
+from uuid import UUID
+
+SORT_FIELDS = ("created_at", "updated_at", "name", "purchase_date")
+SORT_PATTERN = r"^-?(created_at|updated_at|name|purchase_date)$"
+DEFAULT_SORT = "-created_at"
+
+_value_parsers = {
+    "created_at": datetime.fromisoformat,
+    "updated_at": datetime.fromisoformat,
+    "name": str,
+    "purchase_date": date.fromisoformat,
+}
+
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    field = sort.lstrip("-")
+    if field not in SORT_FIELDS:
+        raise ValueError(f"Cannot sort by {field}")
+    return field, sort.startswith("-")
+
+
+def encode_cursor(sort: str, value: Any, asset_id: UUID) -> str:
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, str(asset_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, asset_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        # Every part of a cursor we issue is a string (value may be null); anything else is forged.
+        if not all(isinstance(part, str) for part in (cursor_sort, asset_id)) or not isinstance(value, (str, type(None))):
+            raise ValueError
+        field, _ = parse_sort(cursor_sort)
+        if cursor_sort != sort:
+            raise ValueError
+        if value is not None:
+            value = _value_parsers[field](value)
+        return value, UUID(asset_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid pagination cursor")
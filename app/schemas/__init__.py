@@ -1,3 +1,37 @@
-from app.schemas.asset import AssetCreate, AssetUpdate, AssetResponse
+from app.schemas.asset import (
+    AssetCreate,
+    AssetUpdate,
+    AssetResponse,
+    AssetSearchResult,
+    AssetBulkCreate,
+    AssetBulkCreateResponse,
+    BulkItemError,
+    AssetFilter,
+    AssetBulkUpdate,
+    AssetBulkDelete,
+    AssetBulkResult,
+    AssetImportSummary,
+    ImportRowError,
+    AnalysisJob,
+    AnalysisBatchItem,
+    AnalysisBatchResult,
+)
 
-__all__ = ["AssetCreate", "AssetUpdate", "AssetResponse"]
+__all__ = [
+    "AssetCreate",
+    "AssetUpdate",
+    "AssetResponse",
+    "AssetSearchResult",
+    "AssetBulkCreate",
+    "AssetBulkCreateResponse",
+    "BulkItemError",
+    "AssetFilter",
+    "AssetBulkUpdate",
+    "AssetBulkDelete",
+    "AssetBulkResult",
+    "AssetImportSummary",
+    "ImportRowError",
+    "AnalysisJob",
+    "AnalysisBatchItem",
+    "AnalysisBatchResult",
+]
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
+from app.config import settings
 
 
 class AssetBase(BaseModel):
@@ -32,8 +33,125 @@ class AssetUpdate(BaseModel):
 
 class AssetResponse(AssetBase):
     id: UUID
+    image_sha256: Optional[str] = None
     created_at: datetime
     updated_at: datetime
-
+    
     class Config:
         from_attributes = True
+
+
+class AssetSearchResult(AssetResponse):
+    rank: float
+    snippet: Optional[str] = None
+
+
+class AssetBulkCreate(BaseModel):
+    # The length is checked before any item is validated, so an oversized batch is cheap to refuse.
+    items: List[AssetCreate] = Field(..., min_length=1, max_length=settings.bulk_max_items)
+
+
+class BulkItemError(BaseModel):
+    index: int
+    serial_number: Optional[str] = None
+    detail: str
+
+
+class AssetBulkCreateResponse(BaseModel):
+    created: List[AssetResponse]
+    errors: List[BulkItemError]
+
+
+class AssetFilter(BaseModel):
+    status: Optional[str] = Field(None, max_length=50)
+    asset_type: Optional[str] = Field(None, max_length=100)
+    assigned_to: Optional[str] = Field(None, max_length=255)
+
+
+class AssetBulkSelection(BaseModel):
+    ids: Optional[List[UUID]] = Field(None, min_length=1)
+    filter: Optional[AssetFilter] = None
+    
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("Filter must set at least one field")
+        return self
+
+
+class AssetBulkChanges(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    asset_type: Optional[str] = Field(None, min_length=1, max_length=100)
+    status: Optional[str] = Field(None, max_length=50)
+    assigned_to: Optional[str] = Field(None, max_length=255)
+    purchase_date: Optional[date] = None
+    purchase_price: Optional[float] = Field(None, ge=0)
+    description: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def check_not_null(self):
+        # These columns are NOT NULL: they may be left out, but not cleared.
+        cleared = [
+            name for name in ("name", "asset_type", "status")
+            if name in self.model_fields_set and getattr(self, name) is None
+        ]
+        if cleared:
+            raise ValueError(f"{', '.join(cleared)} cannot be null")
+        return self
+
+
+class AssetBulkUpdate(AssetBulkSelection):
+    changes: AssetBulkChanges
+    
+    @model_validator(mode="after")
+    def check_changes(self):
+        if not self.changes.model_dump(exclude_unset=True):
+            raise ValueError("Changes must set at least one field")
+        return self
+
+
+class AssetBulkDelete(AssetBulkSelection):
+    pass
+
+
+class AssetBulkResult(BaseModel):
+    count: int
+    ids: List[UUID]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    detail: str
+
+
+class AssetImportSummary(BaseModel):
+    inserted: int
+    updated: int
+    rejected: int
+    errors: List[ImportRowError]
+
+
+class AnalysisJob(BaseModel):
+    job_id: str
+    asset_id: UUID
+    status: str
+    description: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
+class AnalysisBatchItem(BaseModel):
+    index: int
+    asset_id: UUID
+    status: str
+    description: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
+class AnalysisBatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    items: List[AnalysisBatchItem]
@@ -26,3 +26,12 @@ class UserResponse(UserBase):
 
     class Config:
         from_attributes = True
+
+
+class Principal(BaseModel):
+    id: UUID
+    is_active: bool
+    is_superuser: bool
+
+    class Config:
+        from_attributes = True
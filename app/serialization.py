@@ -0,0 +1,99 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, NamedTuple
+from uuid import UUID
+import msgpack
+import orjson
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.config import settings
+
+# msgpack extension type codes. They are part of the stored format, so never renumber them.
+EXT_UUID = 1
+EXT_DATE = 2
+EXT_DATETIME = 3
+EXT_DECIMAL = 4
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _msgpack_default(value: Any) -> msgpack.ExtType:
+    if isinstance(value, UUID):
+        return msgpack.ExtType(EXT_UUID, value.bytes)
+    # datetime is a subclass of date, so it has to be checked first.
+    if isinstance(value, datetime):
+        return msgpack.ExtType(EXT_DATETIME, value.isoformat().encode("ascii"))
+    if isinstance(value, date):
+        return msgpack.ExtType(EXT_DATE, value.isoformat().encode("ascii"))
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(EXT_DECIMAL, str(value).encode("ascii"))
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_UUID:
+        return UUID(bytes=data)
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode("ascii"))
+    if code == EXT_DATE:
+        return date.fromisoformat(data.decode("ascii"))
+    if code == EXT_DECIMAL:
+        return Decimal(data.decode("ascii"))
+    return msgpack.ExtType(code, data)
+
+
+# JSON codecs write UUIDs and dates as strings and Decimals as floats, and read them back as
+# plain JSON types. msgpack keeps every one of them as an extension type and restores it as is.
+class Codec(NamedTuple):
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+CODECS: Dict[str, Codec] = {
+    "json": Codec(
+        "json",
+        lambda value: json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8"),
+        json.loads
+    ),
+    "orjson": Codec(
+        "orjson",
+        lambda value: orjson.dumps(value, default=_json_default),
+        orjson.loads
+    ),
+    "msgpack": Codec(
+        "msgpack",
+        lambda value: msgpack.packb(value, default=_msgpack_default, use_bin_type=True),
+        lambda raw: msgpack.unpackb(raw, ext_hook=_msgpack_ext_hook, raw=False)
+    ),
+}
+
+RESPONSE_CLASSES = {
+    "json": JSONResponse,
+    "orjson": ORJSONResponse,
+}
+
+
+def get_codec(name: str) -> Codec:
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown codec {name!r}, expected one of {', '.join(CODECS)}")
+
+
+def get_response_class(name: str) -> type:
+    try:
+        return RESPONSE_CLASSES[name]
+    except KeyError:
+        raise ValueError(f"Unknown response codec {name!r}, expected one of {', '.join(RESPONSE_CLASSES)}")
+
+
+cache_codec = get_codec(settings.cache_codec)
@@ -1,28 +1,97 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
 from app.config import settings
-from typing import Optional
+from app.metrics import AI_CIRCUIT_OPEN
+from typing import Awaitable, Callable, Optional, TypeVar
+import asyncio
 import base64
+import time
 
+T = TypeVar("T")
 
-def generate_asset_description(image_data: bytes, image_format: str = "png") -> Optional[str]:
-    if not settings.openai_api_key:
-        raise ValueError("OpenAI API key not configured")
+# Bump whenever PROMPT changes so cached descriptions from the old prompt are not reused.
+PROMPT_VERSION = "1"
+PROMPT = "Describe this asset image in detail, including its condition, appearance, and any notable features. Be specific about the type of device, its physical state, and any visible characteristics."
+
+_client: Optional[AsyncOpenAI] = None
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None and time.monotonic() - self.opened_at < self.cooldown
+    
+    def reset(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+    
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        # Once the cooldown has passed calls are let through again; the failure
+        # count is kept, so a single further failure reopens the circuit.
+        if self.is_open:
+            raise CircuitOpen("AI service is unavailable, try again later")
+        try:
+            result = await func()
+        except Exception:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            raise
+        self.reset()
+        return result
+
+
+model_breaker = CircuitBreaker(
+    threshold=settings.openai_breaker_threshold,
+    cooldown=settings.openai_breaker_cooldown
+)
+AI_CIRCUIT_OPEN.set_function(lambda: int(model_breaker.is_open))
+
+
+def prompt_version() -> str:
+    return f"{PROMPT_VERSION}:{settings.openai_model}"
+
+
+def get_openai_client() -> AsyncOpenAI:
+    # One client per process keeps its HTTP connection pool warm across requests.
+    global _client
+    if _client is None:
+        if not settings.openai_api_key:
+            raise ValueError("OpenAI API key not configured")
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            timeout=settings.openai_timeout,
+            max_retries=settings.openai_max_retries
+        )
+    return _client
+
+
+async def generate_asset_description(image_data: bytes, image_format: str = "png") -> Optional[str]:
+    client = get_openai_client()
     
     try:
-        client = OpenAI(api_key=settings.openai_api_key)
-        
         base64_image = base64.b64encode(image_data).decode('utf-8')
         image_url = f"data:image/{image_format};base64,{base64_image}"
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = await client.chat.completions.create(
+            model=settings.openai_model,
             messages=[
                 {
                     "role": "user",
                     "content": [
                         {
                             "type": "text",
-                            "text": "Describe this asset image in detail, including its condition, appearance, and any notable features. Be specific about the type of device, its physical state, and any visible characteristics."
+                            "text": PROMPT
                         },
                         {
                             "type": "image_url",
@@ -41,3 +110,16 @@ def generate_asset_description(image_data: bytes, image_format: str = "png") ->
     
     except Exception as e:
         raise ValueError(f"Failed to generate description: {str(e)}")
+
+
+async def describe_image(image_data: bytes, image_format: str = "jpeg") -> str:
+    async def call() -> str:
+        try:
+            return await asyncio.wait_for(
+                generate_asset_description(image_data, image_format),
+                timeout=settings.openai_call_timeout
+            )
+        except asyncio.TimeoutError:
+            raise ValueError(f"Failed to generate description: no answer within {settings.openai_call_timeout:g}s")
+    
+    return await model_breaker.call(call)
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from app.cache import async_redis_client, cache_key, delete_namespaced_async
+from app.config import settings
+from app.crud import assets as crud
+from app.crud.descriptions import (
+    get_cached_description_async,
+    get_cached_descriptions_async,
+    store_description_async,
+    store_descriptions_async,
+)
+from app.database import AsyncSessionLocal
+from app.metrics import AI_DEDUP_HITS, AI_DEDUP_MISSES
+from app.schemas.asset import AssetUpdate
+from app.serialization import cache_codec
+from app.services.ai import describe_image, prompt_version
+from app.services.images import image_digest
+
+logger = logging.getLogger(__name__)
+
+_stats = {"dedup_hits": 0, "dedup_misses": 0}
+_stats_lock = threading.Lock()
+
+
+class AnalysisQueueFull(Exception):
+    pass
+
+
+def job_key(job_id: str) -> str:
+    return cache_key("analysis", job_id=job_id)
+
+
+# Job state lives in Redis, not the local tier, so a poll answered by any
+# worker process sees the latest status.
+async def save_job(job: Dict[str, Any]) -> None:
+    await async_redis_client.setex(job_key(job["job_id"]), settings.analysis_job_ttl, cache_codec.dumps(job))
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    raw = await async_redis_client.get(job_key(job_id))
+    return cache_codec.loads(raw) if raw else None
+
+
+def _count_dedup(hit: bool) -> None:
+    with _stats_lock:
+        _stats["dedup_hits" if hit else "dedup_misses"] += 1
+    (AI_DEDUP_HITS if hit else AI_DEDUP_MISSES).inc()
+
+
+def analysis_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["dedup_hits"] + stats["dedup_misses"]
+    stats["dedup_hit_ratio"] = stats["dedup_hits"] / lookups if lookups else 0.0
+    return stats
+
+
+class AnalysisJobs:
+    def __init__(self, workers: int, queue_size: int, batch_concurrency: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_concurrency = batch_concurrency
+        self.session_factory = AsyncSessionLocal
+        self._queue: Optional["asyncio.Queue[Tuple[Dict[str, Any], bytes, str]]"] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # Shared by every batch request in this process, so concurrent batches
+        # together never have more than batch_concurrency model calls in flight.
+        self._batch_slots = asyncio.Semaphore(self.batch_concurrency)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._batch_slots = None
+    
+    async def submit(self, asset_id: UUID, image_data: bytes, image_format: str) -> Dict[str, Any]:
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "asset_id": str(asset_id),
+            "status": "queued",
+            "description": None,
+            "error": None,
+            "cached": False,
+            "image_sha256": await asyncio.to_thread(image_digest, image_data),
+        }
+        
+        # An image analysed before is answered from the description cache right
+        # away, without a model call or a trip through the queue.
+        async with self.session_factory() as db:
+            description = await get_cached_description_async(db, job["image_sha256"], prompt_version())
+        _count_dedup(description is not None)
+        if description is not None:
+            job["cached"] = True
+            await self._complete(job, description)
+            return job
+        
+        if self._queue is None or self._queue.full():
+            raise AnalysisQueueFull("Image analysis queue is full")
+        await save_job(job)
+        self._queue.put_nowait((job, image_data, image_format))
+        return job
+    
+    async def _worker(self) -> None:
+        while True:
+            job, image_data, image_format = await self._queue.get()
+            try:
+                await self._run(job, image_data, image_format)
+            except Exception:
+                logger.exception("Image analysis job %s could not be recorded", job["job_id"])
+            finally:
+                self._queue.task_done()
+    
+    async def _run(self, job: Dict[str, Any], image_data: bytes, image_format: str) -> None:
+        job["status"] = "running"
+        await save_job(job)
+        try:
+            description = await describe_image(image_data, image_format)
+            async with self.session_factory() as db:
+                await store_description_async(db, job["image_sha256"], prompt_version(), description)
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            await save_job(job)
+            return
+        await self._complete(job, description)
+    
+    async def analyze_batch(self, items: Dict[int, Tuple[UUID, bytes]]) -> Dict[int, Dict[str, Any]]:
+        if self._batch_slots is None:
+            raise AnalysisQueueFull("Image analysis is not running")
+        version = prompt_version()
+        digests = dict(zip(items, await asyncio.gather(
+            *(asyncio.to_thread(image_digest, image_data) for _, image_data in items.values())
+        )))
+        async with self.session_factory() as db:
+            existing = await crud.existing_asset_ids_async(db, {asset_id for asset_id, _ in items.values()})
+            cached = await get_cached_descriptions_async(db, set(digests.values()), version)
+        
+        # The same photo twice in one batch is only sent to the model once.
+        pending: Dict[str, bytes] = {}
+        for index, (asset_id, image_data) in items.items():
+            if asset_id in existing:
+                _count_dedup(digests[index] in cached)
+                if digests[index] not in cached:
+                    pending.setdefault(digests[index], image_data)
+        
+        async def call(image_data: bytes) -> str:
+            async with self._batch_slots:
+                return await describe_image(image_data)
+        
+        outcomes = dict(zip(pending, await asyncio.gather(
+            *(call(image_data) for image_data in pending.values()),
+            return_exceptions=True
+        )))
+        generated = {digest: outcome for digest, outcome in outcomes.items() if isinstance(outcome, str)}
+        found = {index: cached[digest] if digest in cached else generated.get(digest) for index, digest in digests.items()}
+        descriptions = {
+            asset_id: found[index]
+            for index, (asset_id, _) in items.items()
+            if asset_id in existing and found[index] is not None
+        }
+        
+        async with self.session_factory() as db:
+            await store_descriptions_async(db, generated, version)
+            updated = set(await crud.set_descriptions_async(db, descriptions))
+        if updated:
+            await delete_namespaced_async("assets", "asset_id", list(updated), bump=["assets:list"])
+        
+        results: Dict[int, Dict[str, Any]] = {}
+        for index, (asset_id, _) in items.items():
+            digest = digests[index]
+            if asset_id not in existing or (found[index] is not None and asset_id not in updated):
+                error = f"Asset with id {asset_id} not found"
+            elif found[index] is None:
+                error = str(outcomes[digest])
+            else:
+                error = None
+            results[index] = {
+                "status": "failed" if error else "succeeded",
+                "description": None if error else found[index],
+                "error": error,
+                "cached": error is None and digest in cached,
+            }
+        return results
+    
+    async def _complete(self, job: Dict[str, Any], description: str) -> None:
+        asset_id = UUID(job["asset_id"])
+        try:
+            async with self.session_factory() as db:
+                updated = await crud.update_asset_async(
+                    db=db,
+                    asset_id=asset_id,
+                    asset_update=AssetUpdate(description=description)
+                )
+            if updated is None:
+                raise ValueError(f"Asset with id {asset_id} not found")
+            await delete_namespaced_async("assets", "asset_id", [asset_id], bump=["assets:list"])
+            job["status"] = "succeeded"
+            job["description"] = description
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+        await save_job(job)
+
+
+analysis_jobs = AnalysisJobs(
+    workers=settings.analysis_workers,
+    queue_size=settings.analysis_queue_size,
+    batch_concurrency=settings.analysis_batch_concurrency
+)
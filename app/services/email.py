@@ -1,8 +1,24 @@
+import logging
+import queue
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.config import settings
-from typing import Optional
+from app.metrics import EMAIL_QUEUE_DEPTH, EMAILS_SENT, EMAILS_FAILED
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _build_message(sender: str, to_email: str, subject: str, body: str) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = sender
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain"))
+    return msg
 
 
 def send_email(
@@ -27,11 +43,7 @@ def send_email(
         return False
     
     try:
-        msg = MIMEMultipart()
-        msg["From"] = smtp_user
-        msg["To"] = to_email
-        msg["Subject"] = subject
-        msg.attach(MIMEText(body, "plain"))
+        msg = _build_message(smtp_user, to_email, subject, body)
         
         with smtplib.SMTP(smtp_host, smtp_port) as server:
             if settings.smtp_use_tls:
@@ -44,6 +56,160 @@ def send_email(
         return False
 
 
+# Queued messages are sent by one worker thread over a long-lived SMTP session,
+# so callers such as login only pay for a queue put.
+class EmailDispatcher:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: Optional[str],
+        password: Optional[str],
+        sender: Optional[str] = None,
+        use_tls: bool = True,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        idle_timeout: float = 30.0
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.sender = sender or user
+        self.use_tls = use_tls
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+        self._queue: "queue.Queue[Optional[Tuple[str, str, str]]]" = queue.Queue(maxsize=max_queue)
+        self._server: Optional[smtplib.SMTP] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+    
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+    
+    def enqueue(self, to_email: str, subject: str, body: str) -> bool:
+        if not self.sender:
+            return False
+        try:
+            self._queue.put_nowait((to_email, subject, body))
+            return True
+        except queue.Full:
+            EMAILS_FAILED.inc()
+            logger.warning("Email queue is full, dropping message to %s", to_email)
+            return False
+    
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        # The sentinel queues behind pending messages, so they are flushed first. If the
+        # queue stays full for the whole timeout, the worker is told to stop after its
+        # current batch instead, and whatever is still queued is dropped.
+        if self._thread is not None and self._thread.is_alive():
+            deadline = time.monotonic() + timeout
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                self._stopping.set()
+            self._thread.join(max(deadline - time.monotonic(), 0))
+        self._thread = None
+    
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                self._disconnect()
+                continue
+            if first is None:
+                break
+            batch = [first]
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    message = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if message is None:
+                    stopping = True
+                    break
+                batch.append(message)
+            self._send_batch(batch)
+            if stopping or self._stopping.is_set():
+                break
+        self._disconnect()
+    
+    def _send_batch(self, batch: List[Tuple[str, str, str]]) -> None:
+        pending = list(batch)
+        for attempt in range(self.max_retries + 1):
+            try:
+                server = self._connect()
+                while pending:
+                    to_email, subject, body = pending[0]
+                    try:
+                        server.send_message(_build_message(self.sender, to_email, subject, body))
+                        EMAILS_SENT.inc()
+                    except smtplib.SMTPRecipientsRefused:
+                        # Retrying cannot fix a rejected address; drop it without holding up the rest.
+                        EMAILS_FAILED.inc()
+                        logger.warning("Recipient %s refused", to_email)
+                    pending.pop(0)
+                return
+            except (smtplib.SMTPException, OSError) as e:
+                # The session may be half-dead; the next attempt starts a fresh one.
+                self._disconnect()
+                if attempt == self.max_retries:
+                    EMAILS_FAILED.inc(len(pending))
+                    logger.warning("Giving up on %d email(s) after %d attempts: %s", len(pending), attempt + 1, e)
+                    return
+                time.sleep(self.retry_backoff * 2 ** attempt)
+    
+    def _connect(self) -> smtplib.SMTP:
+        if self._server is None:
+            server = smtplib.SMTP(self.host, self.port, timeout=30)
+            try:
+                if self.use_tls:
+                    server.starttls()
+                if self.user and self.password:
+                    server.login(self.user, self.password)
+            except (smtplib.SMTPException, OSError):
+                server.close()
+                raise
+            self._server = server
+        return self._server
+    
+    def _disconnect(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                self._server.close()
+            self._server = None
+
+
+email_dispatcher = EmailDispatcher(
+    host=settings.smtp_host,
+    port=settings.smtp_port,
+    user=settings.smtp_user,
+    password=settings.smtp_password,
+    use_tls=settings.smtp_use_tls,
+    max_queue=settings.email_queue_max_size,
+    batch_size=settings.email_batch_size,
+    max_retries=settings.email_max_retries,
+    retry_backoff=settings.email_retry_backoff,
+    idle_timeout=settings.email_idle_timeout
+)
+EMAIL_QUEUE_DEPTH.set_function(lambda: email_dispatcher.depth)
+
+
 def send_ip_change_alert(email: str, new_ip: str, old_ip: Optional[str] = None) -> bool:
     subject = "Security Alert: New Login Location Detected"
     
@@ -75,4 +241,4 @@ Best regards,
 Asset Management System
 """
     
-    return send_email(to_email=email, subject=subject, body=body)
+    return email_dispatcher.enqueue(to_email=email, subject=subject, body=body)
@@ -0,0 +1,46 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List
+from uuid import UUID
+from sqlalchemy.engine import Row
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def iter_ndjson(rows: Iterable[Row], chunk_rows: int = 500) -> Iterator[str]:
+    lines: List[str] = []
+    for row in rows:
+        record = {key: _export_value(value) for key, value in row._mapping.items()}
+        lines.append(json.dumps(record))
+        if len(lines) >= chunk_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_csv(rows: Iterable[Row], fieldnames: List[str], chunk_rows: int = 500) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    pending = 0
+    for row in rows:
+        writer.writerow(["" if value is None else _export_value(value) for value in row])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
@@ -0,0 +1,51 @@
+import hashlib
+import io
+from typing import BinaryIO, Tuple
+from PIL import Image, ImageOps, UnidentifiedImageError
+from app.config import settings
+
+
+class InvalidImage(Exception):
+    pass
+
+
+def image_digest(image_data: bytes) -> str:
+    # Hash decoded pixels rather than file bytes, so re-encoded copies of the same
+    # photo, or copies that differ only in metadata, share one digest.
+    try:
+        with Image.open(io.BytesIO(image_data)) as image:
+            normalized = ImageOps.exif_transpose(image).convert("RGB")
+            hasher = hashlib.sha256(f"{normalized.width}x{normalized.height}:".encode("ascii"))
+            hasher.update(normalized.tobytes())
+            return hasher.hexdigest()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return hashlib.sha256(image_data).hexdigest()
+
+
+def _fit(size: Tuple[int, int]) -> Tuple[int, int]:
+    width, height = size
+    scale = min(
+        1.0,
+        settings.ai_image_long_side / max(width, height),
+        settings.ai_image_short_side / min(width, height)
+    )
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def prepare_image(stream: BinaryIO) -> bytes:
+    # The vision model scales images down to fit these bounds anyway, so doing it
+    # here shrinks the upstream payload without changing what the model sees.
+    # draft() lets the JPEG decoder skip straight to a reduced scale, so the full
+    # resolution bitmap is never held in memory.
+    try:
+        with Image.open(stream) as image:
+            image.draft("RGB", _fit(image.size))
+            normalized = ImageOps.exif_transpose(image).convert("RGB")
+            target = _fit(normalized.size)
+            if target != normalized.size:
+                normalized = normalized.resize(target, Image.LANCZOS)
+            output = io.BytesIO()
+            normalized.save(output, format="JPEG", quality=settings.ai_image_quality, optimize=True)
+            return output.getvalue()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise InvalidImage("File is not a valid image") from e
@@ -0,0 +1,190 @@
+import csv
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from app.schemas.asset import AssetCreate
+
+
+class InvalidEncoding(ValueError):
+    pass
+
+
+def _decode_line(raw: bytes, line_number: int) -> str:
+    try:
+        return raw.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        raise InvalidEncoding(f"Line {line_number} is not valid UTF-8")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Optional[str]]:
+    # Lines are split as bytes: b"\n" never occurs inside a multi-byte UTF-8 sequence, so
+    # each line is decoded on its own. A line longer than max_line_bytes is discarded as
+    # it streams in rather than buffered, and yielded as None.
+    pending = bytearray()
+    oversized = False
+    line_number = 0
+    async for chunk in chunks:
+        start = 0
+        end = chunk.find(b"\n")
+        while end != -1:
+            line_number += 1
+            if oversized or len(pending) + end - start > max_line_bytes:
+                yield None
+            else:
+                pending += chunk[start:end]
+                yield _decode_line(bytes(pending), line_number)
+            pending.clear()
+            oversized = False
+            start = end + 1
+            end = chunk.find(b"\n", start)
+        if not oversized and len(pending) + len(chunk) - start > max_line_bytes:
+            pending.clear()
+            oversized = True
+        elif not oversized:
+            pending += chunk[start:]
+    if oversized:
+        yield None
+    elif pending:
+        yield _decode_line(bytes(pending), line_number + 1)
+
+
+class _LineFeed:
+    # Lines are handed to one long-lived csv.reader as whole records arrive, so a
+    # quoted field spanning several lines is parsed the same way the CSV export
+    # wrote it.
+    def __init__(self):
+        self.lines = deque()
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+def _ends_in_quotes(line: str, in_quotes: bool) -> bool:
+    # Follows csv's default dialect: a quote opens a field only at its start,
+    # and "" inside a quoted field is an escaped quote.
+    field_start = not in_quotes
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if in_quotes:
+            if char == '"':
+                if line[i + 1:i + 2] == '"':
+                    i += 1
+                else:
+                    in_quotes = False
+        elif char == '"' and field_start:
+            in_quotes = True
+        field_start = not in_quotes and char == ","
+        i += 1
+    return in_quotes
+
+
+async def _csv_records(
+    lines: AsyncIterator[Optional[str]],
+    max_record_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header: Optional[List[str]] = None
+    line_number = 0
+    start = 0
+    size = 0
+    in_quotes = False
+    skipping = False
+    too_large = f"Record exceeds {max_record_bytes} bytes"
+    
+    def parse(start: int) -> Tuple[int, Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            values = next(reader)
+        except csv.Error as e:
+            return start, None, str(e)
+        if len(values) != len(header):
+            return start, None, f"Expected {len(header)} columns, got {len(values)}"
+        return start, {key: value for key, value in zip(header, values) if value != ""}, None
+    
+    async for line in lines:
+        line_number += 1
+        if line is None:
+            # The dropped line's quotes cannot be tracked, so parsing resumes at the
+            # next line as a new record.
+            if not skipping:
+                yield (start if feed.lines else line_number), None, too_large
+            feed.lines.clear()
+            in_quotes = skipping = False
+            continue
+        if skipping:
+            # Rest of a rejected quoted record: follow its quotes without keeping it.
+            in_quotes = skipping = _ends_in_quotes(line, in_quotes)
+            continue
+        if not feed.lines:
+            if not line.strip():
+                continue
+            start = line_number
+            size = 0
+        feed.lines.append(line + "\n")
+        size += len(line.encode("utf-8")) + 1
+        in_quotes = _ends_in_quotes(line, in_quotes)
+        if size > max_record_bytes:
+            yield start, None, too_large
+            feed.lines.clear()
+            skipping = in_quotes
+            continue
+        if in_quotes:
+            continue
+        if header is None:
+            header = [name.strip() for name in next(reader)]
+            continue
+        yield parse(start)
+    if feed.lines and header is not None:
+        if in_quotes:
+            yield start, None, "Unterminated quoted field"
+        else:
+            yield parse(start)
+
+
+async def _ndjson_records(
+    lines: AsyncIterator[Optional[str]],
+    max_record_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if line is None:
+            yield line_number, None, f"Record exceeds {max_record_bytes} bytes"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, str(e)
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, record, None
+
+
+async def iter_assets(
+    lines: AsyncIterator[Optional[str]],
+    format: str,
+    max_record_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[AssetCreate], Optional[str]]]:
+    parse = _csv_records if format == "csv" else _ndjson_records
+    records = parse(lines, max_record_bytes)
+    async for line_number, record, error in records:
+        if error is not None:
+            yield line_number, None, error
+            continue
+        try:
+            yield line_number, AssetCreate.model_validate(record), None
+        except ValidationError as e:
+            yield line_number, None, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
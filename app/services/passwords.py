@@ -0,0 +1,44 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+from passlib.context import CryptContext
+from app.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordPoolSaturated(Exception):
+    pass
+
+
+# bcrypt releases the GIL while it hashes, so worker threads give real parallelism
+# without the start-up and pickling cost of a process pool.
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max_pending)
+    
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        # Fail fast instead of queueing: a login that would wait behind a long queue
+        # is better told to retry.
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolSaturated("Password hashing pool is saturated")
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+    
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(pwd_context.verify, password, hashed_password))
+    
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(pwd_context.hash, password))
+    
+    def hash_sync(self, password: str) -> str:
+        return self._submit(pwd_context.hash, password).result()
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending
+)
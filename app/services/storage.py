@@ -0,0 +1,78 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+from PIL import Image, ImageOps
+from app.config import settings
+
+
+class StoredImage(NamedTuple):
+    sha256: str
+    content_type: str
+
+
+class ImageStore:
+    def __init__(self, root: str, thumbnail_size: int, chunk_size: int = 1024 * 1024):
+        self.root = Path(root)
+        self.thumbnail_size = thumbnail_size
+        self.chunk_size = chunk_size
+    
+    def original_path(self, sha256: str) -> Path:
+        return self.root / "originals" / sha256[:2] / sha256
+    
+    def thumbnail_path(self, sha256: str) -> Path:
+        return self.root / "thumbnails" / sha256[:2] / f"{sha256}.jpg"
+    
+    def _temp_file(self):
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False)
+    
+    def _publish(self, temp_path: str, path: Path) -> None:
+        # Files are written under tmp/ and renamed into place, so readers never
+        # see a partial file. Identical content has one path, so a file that is
+        # already there is kept and the new copy dropped.
+        if path.exists():
+            os.unlink(temp_path)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, path)
+    
+    def put(self, stream: BinaryIO) -> StoredImage:
+        hasher = hashlib.sha256()
+        with self._temp_file() as out:
+            try:
+                while chunk := stream.read(self.chunk_size):
+                    hasher.update(chunk)
+                    out.write(chunk)
+            except BaseException:
+                os.unlink(out.name)
+                raise
+        sha256 = hasher.hexdigest()
+        self._publish(out.name, self.original_path(sha256))
+        
+        with Image.open(self.original_path(sha256)) as image:
+            content_type = Image.MIME.get(image.format, "application/octet-stream")
+            if not self.thumbnail_path(sha256).exists():
+                self._write_thumbnail(image, sha256)
+        return StoredImage(sha256=sha256, content_type=content_type)
+    
+    def _write_thumbnail(self, image: Image.Image, sha256: str) -> None:
+        image.draft("RGB", (self.thumbnail_size, self.thumbnail_size))
+        thumbnail = ImageOps.exif_transpose(image).convert("RGB")
+        thumbnail.thumbnail((self.thumbnail_size, self.thumbnail_size), Image.LANCZOS)
+        with self._temp_file() as out:
+            try:
+                thumbnail.save(out, format="JPEG", quality=85)
+            except BaseException:
+                os.unlink(out.name)
+                raise
+        self._publish(out.name, self.thumbnail_path(sha256))
+
+
+image_store = ImageStore(
+    root=settings.image_store_path,
+    thumbnail_size=settings.thumbnail_size,
+    chunk_size=settings.upload_chunk_size
+)
@@ -0,0 +1,74 @@
+"""Compare cache codecs: encode/decode time and Redis memory per cached page.
+
+Each codec encodes the same page of assets, built with native UUID, date,
+datetime and Decimal values. Sizes are reported as encoded and as measured
+by Redis ``MEMORY USAGE`` after storing the page.
+
+    docker-compose exec api python -m benchmarks.bench_codecs --rows 100 1000
+"""
+import argparse
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+import redis
+from app.config import settings
+from app.serialization import CODECS
+
+
+def build_page(rows: int) -> List[Dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Bench asset {i}",
+            "asset_type": "laptop",
+            "serial_number": f"BENCH-{i:06d}",
+            "status": "active",
+            "assigned_to": "user@example.com",
+            "purchase_date": date(2024, 1, 1),
+            "purchase_price": Decimal("1299.99"),
+            "description": "Standard issue developer laptop with docking station and charger",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+
+
+def time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    client = redis.from_url(settings.redis_url, socket_connect_timeout=5)
+    print(f"{'codec':<9}{'rows':>7}{'encode ms':>11}{'decode ms':>11}{'bytes':>10}{'redis bytes':>13}")
+    for rows in args.rows:
+        page = build_page(rows)
+        for name, codec in CODECS.items():
+            raw = codec.dumps(page)
+            encode_ms = time_per_call(lambda: codec.dumps(page), args.iterations)
+            decode_ms = time_per_call(lambda: codec.loads(raw), args.iterations)
+
+            key = f"bench:codec:{name}:{rows}"
+            try:
+                client.set(key, raw, ex=60)
+                memory = client.memory_usage(key)
+                client.delete(key)
+            except redis.RedisError:
+                memory = None
+            memory_text = f"{memory:>13}" if memory is not None else f"{'n/a':>13}"
+            print(f"{name:<9}{rows:>7}{encode_ms:>11.3f}{decode_ms:>11.3f}{len(raw):>10}{memory_text}")
+
+
+if __name__ == "__main__":
+    main()
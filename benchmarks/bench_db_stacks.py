@@ -0,0 +1,104 @@
+"""Compare throughput of the sync (psycopg2) and async (asyncpg) database stacks.
+
+Both stacks serve the same list query behind a minimal FastAPI app, driven
+in-process through httpx with a fixed number of concurrent clients.
+
+    docker-compose exec api python -m benchmarks.bench_db_stacks --requests 2000 --concurrency 50
+
+``--query-delay`` adds a server-side ``pg_sleep`` to each request, which shows
+how the sync stack is bounded by the worker threadpool while the async stack
+is bounded only by the connection pool.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from fastapi import FastAPI, Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.crud import assets as crud
+from app.database import get_db, get_async_db, SessionLocal, async_engine
+from app.schemas.asset import AssetCreate
+
+bench_app = FastAPI()
+query_delay = 0.0
+
+
+@bench_app.get("/sync")
+def list_sync(db: Session = Depends(get_db)):
+    if query_delay:
+        db.execute(text("SELECT pg_sleep(:delay)"), {"delay": query_delay})
+    return len(crud.get_assets(db, limit=50))
+
+
+@bench_app.get("/async")
+async def list_async(db: AsyncSession = Depends(get_async_db)):
+    if query_delay:
+        await db.execute(text("SELECT pg_sleep(:delay)"), {"delay": query_delay})
+    return len(await crud.get_assets_async(db, limit=50))
+
+
+def seed(count: int) -> None:
+    items = [
+        AssetCreate(name=f"Bench {i}", asset_type="laptop", serial_number=f"BENCH-{i:06d}")
+        for i in range(count)
+    ]
+    with SessionLocal() as db:
+        for start in range(0, count, 1000):
+            crud.create_assets_bulk(db, items[start:start + 1000])
+
+
+async def run(path: str, total: int, concurrency: int) -> dict:
+    latencies = []
+    remaining = iter(range(total))
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def compare(total: int, concurrency: int) -> None:
+    # One event loop for everything: pooled asyncpg connections are bound to the loop that opened them.
+    print(f"{'stack':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, path in (("sync", "/sync"), ("async", "/async")):
+        await run(path, min(concurrency, total), concurrency)  # warm up the pools
+        result = await run(path, total, concurrency)
+        print(f"{name:<8}{result['rps']:>10.0f}{result['p50']:>10.1f}{result['p99']:>10.1f}")
+    await async_engine.dispose()
+
+
+def main() -> None:
+    global query_delay
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-delay", type=float, default=0.0, help="seconds of pg_sleep per request")
+    parser.add_argument("--seed", type=int, default=0, help="insert this many assets first")
+    args = parser.parse_args()
+    query_delay = args.query_delay
+
+    if args.seed:
+        seed(args.seed)
+
+    asyncio.run(compare(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
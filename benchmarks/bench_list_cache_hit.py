@@ -0,0 +1,102 @@
+"""Compare list-page cache hits served as model objects versus pre-serialized bodies.
+
+``models`` replays the previous hit path: decode the cached JSON, rebuild one
+``AssetResponse`` per row and let FastAPI validate and serialize them again.
+``bytes`` is the current path: the cached body is written out unchanged.
+Pages are held in memory, like an in-process cache hit, so only the
+per-request serialization work is measured.
+
+    docker-compose exec api python -m benchmarks.bench_list_cache_hit --requests 500
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import List
+import httpx
+from fastapi import FastAPI, Response
+from pydantic import TypeAdapter
+from app.schemas.asset import AssetResponse
+
+bench_app = FastAPI()
+asset_list_adapter = TypeAdapter(List[AssetResponse])
+pages = {}
+
+
+@bench_app.get("/models/{limit}", response_model=List[AssetResponse])
+def hit_models(limit: int):
+    page = json.loads(pages[limit]["legacy"])
+    return [AssetResponse(**asset) for asset in page["items"]]
+
+
+@bench_app.get("/bytes/{limit}", response_model=List[AssetResponse])
+def hit_bytes(limit: int):
+    return Response(content=pages[limit]["body"], media_type="application/json")
+
+
+def build_pages(limits: List[int]) -> None:
+    now = datetime.now(timezone.utc)
+    for limit in limits:
+        assets = [
+            AssetResponse(
+                id=uuid.uuid4(),
+                name=f"Bench asset {i}",
+                asset_type="laptop",
+                serial_number=f"BENCH-{i:06d}",
+                status="active",
+                purchase_date=date(2024, 1, 1),
+                purchase_price=1299.99,
+                description="Standard issue developer laptop with docking station and charger",
+                assigned_to="user@example.com",
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(limit)
+        ]
+        body = asset_list_adapter.dump_json(assets).decode("utf-8")
+        # The models path keeps its cached page in the previous {"items": [...]} form.
+        legacy = json.dumps({"items": json.loads(body), "next_cursor": None})
+        pages[limit] = {"body": body, "legacy": legacy}
+
+
+async def run(path: str, total: int) -> dict:
+    latencies = []
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(total):
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def compare(limits: List[int], total: int) -> None:
+    print(f"{'path':<8}{'limit':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for limit in limits:
+        for name in ("models", "bytes"):
+            path = f"/{name}/{limit}"
+            await run(path, 20)
+            result = await run(path, total)
+            print(f"{name:<8}{limit:>8}{result['p50']:>10.2f}{result['p99']:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--limits", type=int, nargs="+", default=[100, 1000])
+    args = parser.parse_args()
+
+    build_pages(args.limits)
+    asyncio.run(compare(args.limits, args.requests))
+
+
+if __name__ == "__main__":
+    main()
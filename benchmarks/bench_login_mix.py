@@ -0,0 +1,98 @@
+"""Measure asset latency while a burst of logins hashes passwords.
+
+Asset readers and login clients hit the real app concurrently, in-process
+through httpx. Asset latency is reported without logins first and then
+alongside the login burst. Login outcomes are counted, and 503 means the
+password pool shed the request.
+
+    docker-compose exec api python -m benchmarks.bench_login_mix --logins 200 --login-concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import List
+import httpx
+from app.crud.users import create_user, get_user_by_email
+from app.database import SessionLocal, async_engine
+from app.main import app
+from app.schemas.user import UserCreate
+
+EMAIL = "bench-login@example.com"
+PASSWORD = "bench-password-123"
+
+
+def ensure_user() -> None:
+    with SessionLocal() as db:
+        if get_user_by_email(db, EMAIL) is None:
+            create_user(db, UserCreate(email=EMAIL, password=PASSWORD))
+
+
+def summarize(latencies: List[float]) -> str:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    return f"p50 {p50:.1f} ms  p99 {p99:.1f} ms  ({len(latencies)} requests)"
+
+
+async def read_assets(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event, latencies: List[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/assets", headers=headers)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def login_burst(client: httpx.AsyncClient, total: int, concurrency: int, outcomes: Counter):
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.post("/auth/login", data={"username": EMAIL, "password": PASSWORD})
+            outcomes[response.status_code] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run(args) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        response = await client.post("/auth/login", data={"username": EMAIL, "password": PASSWORD})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for label, logins in (("idle", 0), ("login burst", args.logins)):
+            stop = asyncio.Event()
+            latencies: List[float] = []
+            outcomes: Counter = Counter()
+            readers = [
+                asyncio.create_task(read_assets(client, headers, stop, latencies))
+                for _ in range(args.readers)
+            ]
+            if logins:
+                await login_burst(client, logins, args.login_concurrency, outcomes)
+            else:
+                await asyncio.sleep(args.idle_seconds)
+            stop.set()
+            await asyncio.gather(*readers)
+            print(f"{label:<12} assets: {summarize(latencies)}")
+            if outcomes:
+                print(f"{'':<12} logins: " + ", ".join(f"{code}: {count}" for code, count in sorted(outcomes.items())))
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-concurrency", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=10)
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    ensure_user()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
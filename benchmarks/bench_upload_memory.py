@@ -0,0 +1,108 @@
+"""Measure peak RSS while concurrent image uploads are prepared for the model.
+
+Each mode runs in a fresh process, because peak RSS is a per-process high-water
+mark. The uploads are spooled to temporary files first, the same way the
+multipart parser leaves them, and the reported figure is the growth in peak RSS
+while they are processed concurrently.
+
+- ``buffered``: the whole upload is read into memory, size-checked, hashed at
+  full resolution and base64-encoded for the model.
+- ``streamed``: the upload is size-checked a chunk at a time, downscaled and
+  re-encoded by ``prepare_image``, then hashed and base64-encoded.
+
+    docker-compose exec api python -m benchmarks.bench_upload_memory --uploads 20 --size-mb 10
+"""
+import argparse
+import asyncio
+import base64
+import io
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from fastapi import UploadFile
+from PIL import Image
+from app.api.routes.assets import _upload_error
+from app.services.images import image_digest, prepare_image
+
+
+def build_image(path: str, size_mb: float) -> int:
+    # Noise compresses badly, so a JPEG of it gets close to the target size.
+    limit = int(size_mb * 1024 * 1024)
+    image = Image.frombytes("RGB", (4000, 3000), os.urandom(4000 * 3000 * 3))
+    for quality in range(95, 0, -5):
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality)
+        if buffer.tell() <= limit:
+            break
+    with open(path, "wb") as f:
+        f.write(buffer.getvalue())
+    return buffer.tell()
+
+
+def spool(path: str) -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    with open(path, "rb") as f:
+        shutil.copyfileobj(f, spooled)
+    spooled.seek(0)
+    return UploadFile(spooled, filename="bench.jpg")
+
+
+async def buffered(upload: UploadFile) -> int:
+    data = await upload.read()
+    await asyncio.to_thread(image_digest, data)
+    return len(f"data:image/jpeg;base64,{base64.b64encode(data).decode('utf-8')}")
+
+
+async def streamed(upload: UploadFile) -> int:
+    await _upload_error(upload)
+    data = await asyncio.to_thread(prepare_image, upload.file)
+    await asyncio.to_thread(image_digest, data)
+    return len(f"data:image/jpeg;base64,{base64.b64encode(data).decode('utf-8')}")
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode: str, path: str, uploads: int, results) -> None:
+    handler = {"buffered": buffered, "streamed": streamed}[mode]
+    files = [spool(path) for _ in range(uploads)]
+    baseline = peak_rss_mb()
+
+    async def process_all():
+        return await asyncio.gather(*(handler(upload) for upload in files))
+
+    started = time.perf_counter()
+    payloads = asyncio.run(process_all())
+    elapsed = time.perf_counter() - started
+    results.put((mode, peak_rss_mb() - baseline, elapsed, payloads[0]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--size-mb", type=float, default=10)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "upload.jpg")
+        size = build_image(path, args.size_mb)
+        print(f"{args.uploads} concurrent uploads of {size / (1024 * 1024):.1f} MB")
+        for mode in ("buffered", "streamed"):
+            results = context.Queue()
+            process = context.Process(target=run_mode, args=(mode, path, args.uploads, results))
+            process.start()
+            mode, rss, elapsed, payload = results.get()
+            process.join()
+            print(
+                f"{mode:<9} peak RSS +{rss:7.1f} MB  {elapsed * 1000:7.0f} ms  "
+                f"model payload {payload / 1024:7.0f} KB per upload"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,93 @@
+import base64
+import io
+import json
 import pytest
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from fastapi import status
+from openai import AsyncOpenAI
+from PIL import Image
 from unittest.mock import patch, MagicMock
+from uuid import uuid4
+from app.services.ai import model_breaker
+from app.services.storage import image_store
+
+STUB_DESCRIPTION = "A red square test image. The device appears to be in good condition."
+
+
+class StubModelHandler(BaseHTTPRequestHandler):
+    """Answers chat completion requests the way the OpenAI API does"""
+    
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        if self.server.fail:
+            self.send_response(400)
+            payload = {"error": {"message": "Unsupported image", "type": "invalid_request_error"}}
+        else:
+            self.send_response(200)
+            payload = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": STUB_DESCRIPTION},
+                    "finish_reason": "stop"
+                }]
+            }
+        data = json.dumps(payload).encode("utf-8")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_model():
+    """Local stand-in for the model API, wired in as the shared OpenAI client"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubModelHandler)
+    server.requests = []
+    server.fail = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = AsyncOpenAI(
+        api_key="test-key",
+        base_url=f"http://127.0.0.1:{server.server_port}/v1",
+        max_retries=0
+    )
+    model_breaker.reset()
+    with patch('app.services.ai._client', client):
+        yield server
+    model_breaker.reset()
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def image_store_root(tmp_path):
+    """Keep stored uploads out of the working tree"""
+    with patch.object(image_store, "root", tmp_path):
+        yield tmp_path
+
+
+def wait_for_job(client, headers, asset_id, job_id, timeout=10.0):
+    deadline = time.time() + timeout
+    while True:
+        job = client.get(f"/assets/{asset_id}/analysis/{job_id}", headers=headers).json()
+        if job["status"] in ("succeeded", "failed") or time.time() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def png_image(color, size=(8, 8)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
 
 
 def create_test_image() -> bytes:
@@ -9,8 +96,8 @@ def create_test_image() -> bytes:
     return b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\tpHYs\x00\x00\x0b\x13\x00\x00\x0b\x13\x01\x00\x9a\x9c\x18\x00\x00\x00\nIDATx\x9cc\xf8\x00\x00\x00\x01\x00\x01\x00\x00\x00\x00IEND\xaeB`\x82'
 
 
-def test_upload_image_success(client):
-    """Test successful image upload and description generation"""
+def test_upload_image_success(client, stub_model):
+    """Test that an image upload queues an analysis job that fills in the description"""
     # Register and login
     user_data = {
         "email": "ai_test@example.com",
@@ -38,32 +125,268 @@ def test_upload_image_success(client):
     create_response = client.post("/assets", json=asset_data, headers=headers)
     asset_id = create_response.json()["id"]
     
-    # Create test image
-    image_data = create_test_image()
+    # Upload image: the response only acknowledges the job
+    files = {"file": ("test.png", create_test_image(), "image/png")}
+    response = client.post(
+        f"/assets/{asset_id}/upload-image",
+        files=files,
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert job["status"] in ("queued", "running")
+    assert job["asset_id"] == str(asset_id)
+    assert response.headers["Location"] == f"/assets/{asset_id}/analysis/{job['job_id']}"
+    
+    job = wait_for_job(client, headers, asset_id, job["job_id"])
+    assert job["status"] == "succeeded"
+    assert job["description"] == STUB_DESCRIPTION
+    assert len(stub_model.requests) == 1
+    assert stub_model.requests[0]["messages"][0]["content"][1]["image_url"]["url"].startswith("data:image/jpeg;base64,")
+    
+    asset = client.get(f"/assets/{asset_id}", headers=headers).json()
+    assert asset["description"] == STUB_DESCRIPTION
+
+
+def test_analysis_job_reports_model_failure(client, auth_headers, stub_model):
+    """Test that a failing model call marks the job as failed"""
+    stub_model.fail = True
+    asset_id = client.post("/assets", json={
+        "name": "Failing Laptop",
+        "asset_type": "laptop",
+        "serial_number": "SN_AI_FAIL"
+    }, headers=auth_headers).json()["id"]
+    
+    files = {"file": ("test.png", create_test_image(), "image/png")}
+    response = client.post(f"/assets/{asset_id}/upload-image", files=files, headers=auth_headers)
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    
+    job = wait_for_job(client, auth_headers, asset_id, response.json()["job_id"])
+    assert job["status"] == "failed"
+    assert "Failed to generate description" in job["error"]
+
+
+def test_repeat_image_uses_description_cache(client, auth_headers, stub_model):
+    """Test that the same image uploaded for a second asset is answered without a model call"""
+    asset_ids = [
+        client.post("/assets", json={
+            "name": f"Dedup Laptop {i}",
+            "asset_type": "laptop",
+            "serial_number": f"SN_AI_DEDUP_{i}"
+        }, headers=auth_headers).json()["id"]
+        for i in range(2)
+    ]
+    files = {"file": ("test.png", create_test_image(), "image/png")}
+    first = client.post(f"/assets/{asset_ids[0]}/upload-image", files=files, headers=auth_headers).json()
+    assert first["cached"] is False
+    assert wait_for_job(client, auth_headers, asset_ids[0], first["job_id"])["status"] == "succeeded"
+    before = client.get("/cache/stats").json()["ai_descriptions"]
+    
+    response = client.post(f"/assets/{asset_ids[1]}/upload-image", files=files, headers=auth_headers)
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    second = response.json()
+    assert second["status"] == "succeeded"
+    assert second["cached"] is True
+    assert second["description"] == STUB_DESCRIPTION
+    assert len(stub_model.requests) == 1
+    
+    asset = client.get(f"/assets/{asset_ids[1]}", headers=auth_headers).json()
+    assert asset["description"] == STUB_DESCRIPTION
+    after = client.get("/cache/stats").json()["ai_descriptions"]
+    assert after["dedup_hits"] == before["dedup_hits"] + 1
+    assert after["dedup_misses"] == before["dedup_misses"]
+
+
+def test_upload_image_is_downscaled_for_model(client, auth_headers, stub_model):
+    """Test that large images are resized to the model's working resolution before submission"""
+    asset_id = client.post("/assets", json={
+        "name": "Wide Laptop",
+        "asset_type": "laptop",
+        "serial_number": "SN_AI_WIDE"
+    }, headers=auth_headers).json()["id"]
+    buffer = io.BytesIO()
+    Image.new("RGB", (4000, 1000), (200, 30, 30)).save(buffer, format="PNG")
+    
+    files = {"file": ("wide.png", buffer.getvalue(), "image/png")}
+    response = client.post(f"/assets/{asset_id}/upload-image", files=files, headers=auth_headers)
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert wait_for_job(client, auth_headers, asset_id, response.json()["job_id"])["status"] == "succeeded"
+    
+    url = stub_model.requests[0]["messages"][0]["content"][1]["image_url"]["url"]
+    sent = Image.open(io.BytesIO(base64.b64decode(url.split(",", 1)[1])))
+    assert sent.format == "JPEG"
+    assert sent.size == (2048, 512)
+
+
+def test_upload_image_undecodable(client, auth_headers, stub_model):
+    """Test that a file with an image content type but unreadable contents is rejected"""
+    asset_id = client.post("/assets", json={
+        "name": "Broken Image Laptop",
+        "asset_type": "laptop",
+        "serial_number": "SN_AI_BROKEN"
+    }, headers=auth_headers).json()["id"]
+    
+    files = {"file": ("broken.png", b"not really a png", "image/png")}
+    response = client.post(f"/assets/{asset_id}/upload-image", files=files, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "valid image" in response.json()["detail"]
+    assert stub_model.requests == []
+
+
+def create_batch_assets(client, headers, count):
+    return [
+        client.post("/assets", json={
+            "name": f"Intake Laptop {i}",
+            "asset_type": "laptop",
+            "serial_number": f"SN_AI_BATCH_{i}"
+        }, headers=headers).json()["id"]
+        for i in range(count)
+    ]
+
+
+def test_analyze_batch_reports_per_item_results(client, auth_headers, stub_model):
+    """Test that a batch updates every analysable asset and reports failures per item"""
+    asset_ids = create_batch_assets(client, auth_headers, 3)
+    red, blue = png_image((255, 0, 0)), png_image((0, 0, 255))
+    pairs = [
+        (asset_ids[0], ("a.png", red, "image/png")),
+        (asset_ids[1], ("b.png", red, "image/png")),
+        (asset_ids[2], ("c.png", blue, "image/png")),
+        (str(uuid4()), ("d.png", blue, "image/png")),
+        (asset_ids[0], ("e.txt", b"not an image", "text/plain")),
+    ]
+    response = client.post(
+        "/assets/analyze-batch",
+        data={"asset_ids": [asset_id for asset_id, _ in pairs]},
+        files=[("files", file) for _, file in pairs],
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["succeeded"] == 3
+    assert result["failed"] == 2
+    assert [item["status"] for item in result["items"]] == ["succeeded"] * 3 + ["failed"] * 2
+    assert "not found" in result["items"][3]["error"]
+    assert "image" in result["items"][4]["error"].lower()
+    # The repeated red image is sent to the model once.
+    assert len(stub_model.requests) == 2
+    
+    for asset_id in asset_ids:
+        asset = client.get(f"/assets/{asset_id}", headers=auth_headers).json()
+        assert asset["description"] == STUB_DESCRIPTION
+
+
+def test_analyze_batch_circuit_breaker(client, auth_headers, stub_model):
+    """Test that once the model keeps failing, later batch items fail fast without calling it"""
+    asset_ids = create_batch_assets(client, auth_headers, 2)
+    stub_model.fail = True
+    with patch.object(model_breaker, "threshold", 1):
+        first = client.post(
+            "/assets/analyze-batch",
+            data={"asset_ids": [asset_ids[0]]},
+            files=[("files", ("a.png", png_image((255, 0, 0)), "image/png"))],
+            headers=auth_headers
+        ).json()
+        second = client.post(
+            "/assets/analyze-batch",
+            data={"asset_ids": [asset_ids[1]]},
+            files=[("files", ("b.png", png_image((0, 255, 0)), "image/png"))],
+            headers=auth_headers
+        ).json()
+    
+    assert first["failed"] == 1
+    assert "Failed to generate description" in first["items"][0]["error"]
+    assert second["failed"] == 1
+    assert "unavailable" in second["items"][0]["error"]
+    assert len(stub_model.requests) == 1
+
+
+def test_analyze_batch_requires_matching_ids(client, auth_headers, stub_model):
+    """Test that every file in a batch needs its own asset id"""
+    response = client.post(
+        "/assets/analyze-batch",
+        data={"asset_ids": [str(uuid4())]},
+        files=[("files", ("a.png", png_image((255, 0, 0)), "image/png"))] * 2,
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_uploaded_image_is_served(client, auth_headers, stub_model):
+    """Test that the original upload and its thumbnail are served with ETag and Range support"""
+    asset_id = client.post("/assets", json={
+        "name": "Photographed Laptop",
+        "asset_type": "laptop",
+        "serial_number": "SN_AI_PHOTO"
+    }, headers=auth_headers).json()["id"]
+    original = png_image((20, 120, 220), size=(600, 400))
+    files = {"file": ("photo.png", original, "image/png")}
+    assert client.post(f"/assets/{asset_id}/upload-image", files=files, headers=auth_headers).status_code == status.HTTP_202_ACCEPTED
+    assert client.get(f"/assets/{asset_id}", headers=auth_headers).json()["image_sha256"] is not None
+    
+    response = client.get(f"/assets/{asset_id}/image", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == original
+    etag = response.headers["etag"]
+    
+    response = client.get(f"/assets/{asset_id}/image", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    response = client.get(f"/assets/{asset_id}/image", headers={**auth_headers, "Range": "bytes=0-9"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == original[:10]
     
-    # Mock OpenAI API response
-    mock_description = "A red square test image. The device appears to be in good condition."
-    
-    with patch('app.services.ai.OpenAI') as mock_openai:
-        mock_client = MagicMock()
-        mock_openai.return_value = mock_client
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = mock_description
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        # Upload image
-        files = {"file": ("test.png", image_data, "image/png")}
-        response = client.post(
-            f"/assets/{asset_id}/upload-image",
-            files=files,
-            headers=headers
-        )
-        
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["description"] == mock_description
-        assert data["id"] == str(asset_id)
+    response = client.get(f"/assets/{asset_id}/image", params={"size": "thumbnail"}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "image/jpeg"
+    assert Image.open(io.BytesIO(response.content)).size == (256, 171)
+
+
+def test_identical_uploads_are_stored_once(client, auth_headers, stub_model, image_store_root):
+    """Test that the image store keeps one copy of identical uploads"""
+    asset_ids = create_batch_assets(client, auth_headers, 2)
+    files = {"file": ("same.png", png_image((90, 90, 90), size=(64, 64)), "image/png")}
+    for asset_id in asset_ids:
+        client.post(f"/assets/{asset_id}/upload-image", files=files, headers=auth_headers)
+    
+    hashes = {client.get(f"/assets/{asset_id}", headers=auth_headers).json()["image_sha256"] for asset_id in asset_ids}
+    assert len(hashes) == 1
+    assert len(list((image_store_root / "originals").rglob("*"))) == 2  # one shard directory, one file
+
+
+def test_upload_without_model_key_leaves_image_unchanged(client, auth_headers, image_store_root):
+    """Test that a missing API key fails the upload before the image is stored"""
+    from app.config import settings
+    asset_id = client.post("/assets", json={
+        "name": "Keyless Laptop",
+        "asset_type": "laptop",
+        "serial_number": "SN_AI_NO_KEY"
+    }, headers=auth_headers).json()["id"]
+    
+    files = {"file": ("photo.png", png_image((200, 10, 10)), "image/png")}
+    with patch('app.services.ai._client', None), patch.object(settings, "openai_api_key", ""):
+        response = client.post(f"/assets/{asset_id}/upload-image", files=files, headers=auth_headers)
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert client.get(f"/assets/{asset_id}", headers=auth_headers).json()["image_sha256"] is None
+    assert not (image_store_root / "originals").exists()
+
+def test_asset_image_not_found(client, auth_headers):
+    """Test that an asset without an uploaded image returns 404"""
+    asset_id = client.post("/assets", json={
+        "name": "Unphotographed Laptop",
+        "asset_type": "laptop",
+        "serial_number": "SN_AI_NO_PHOTO"
+    }, headers=auth_headers).json()["id"]
+    response = client.get(f"/assets/{asset_id}/image", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_analysis_job_not_found(client, auth_headers):
+    """Test that unknown job ids return 404"""
+    from uuid import uuid4
+    response = client.get(f"/assets/{uuid4()}/analysis/missing", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
 def test_upload_image_invalid_file_type(client):
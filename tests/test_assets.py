@@ -168,3 +168,116 @@ def test_list_assets_pagination(client, auth_headers):
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert len(data) == 2
+
+
+def test_list_assets_cursor_pagination(client, auth_headers):
+    """Test walking the asset list with keyset cursors"""
+    for i in range(5):
+        asset_data = {
+            "name": f"Cursor Asset {i}",
+            "asset_type": "laptop",
+            "serial_number": f"SN_CURSOR_{i:03d}",
+            "status": "active"
+        }
+        client.post("/assets", json=asset_data, headers=auth_headers)
+    
+    seen = []
+    cursor = None
+    while True:
+        url = "/assets?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(a["id"] for a in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_list_assets_invalid_cursor(client, auth_headers):
+    """Test that a malformed cursor is rejected"""
+    response = client.get("/assets?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_assets_cursor_with_wrong_types(client, auth_headers):
+    """Test that a well-formed cursor carrying non-string parts is rejected"""
+    import base64
+    import json
+    for parts in (["-created_at", "2024-01-01T00:00:00", 42], [1, "2024-01-01T00:00:00", "x"], ["name", ["a"], "x"]):
+        cursor = base64.urlsafe_b64encode(json.dumps(parts).encode("utf-8")).decode("ascii").rstrip("=")
+        sort = parts[0] if isinstance(parts[0], str) else "-created_at"
+        response = client.get(f"/assets?sort={sort}&cursor={cursor}", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_assets_limit_capped(client, auth_headers):
+    """Test that oversized page limits are rejected"""
+    response = client.get("/assets?limit=1000000", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_list_assets_filters(client, auth_headers):
+    """Test filtering the asset list by status, type and assignee"""
+    assets = [
+        {"name": "Laptop A", "asset_type": "laptop", "serial_number": "SN_FILTER_001", "status": "active", "assigned_to": "Alice"},
+        {"name": "Laptop B", "asset_type": "laptop", "serial_number": "SN_FILTER_002", "status": "retired", "assigned_to": "Bob"},
+        {"name": "Monitor C", "asset_type": "monitor", "serial_number": "SN_FILTER_003", "status": "active", "assigned_to": "Alice"}
+    ]
+    for asset in assets:
+        client.post("/assets", json=asset, headers=auth_headers)
+    
+    response = client.get("/assets?status=active&asset_type=laptop", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [a["serial_number"] for a in response.json()] == ["SN_FILTER_001"]
+    
+    response = client.get("/assets?assigned_to=Alice", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert {a["serial_number"] for a in response.json()} == {"SN_FILTER_001", "SN_FILTER_003"}
+
+
+def test_list_assets_empty_filter_is_ignored(client, auth_headers):
+    """Test that an empty filter value lists everything and does not poison the unfiltered page"""
+    client.post("/assets", json={"name": "Laptop", "asset_type": "laptop", "serial_number": "SN_EMPTY_FILTER"}, headers=auth_headers)
+    
+    response = client.get("/assets?status=&asset_type=&assigned_to=", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [a["serial_number"] for a in response.json()] == ["SN_EMPTY_FILTER"]
+    
+    response = client.get("/assets", headers=auth_headers)
+    assert [a["serial_number"] for a in response.json()] == ["SN_EMPTY_FILTER"]
+
+
+def test_list_assets_sort_with_cursor(client, auth_headers):
+    """Test sorting by name across cursor pages"""
+    for name in ["Charlie", "Alpha", "Echo", "Bravo", "Delta"]:
+        asset_data = {
+            "name": name,
+            "asset_type": "laptop",
+            "serial_number": f"SN_SORT_{name}",
+            "status": "active"
+        }
+        client.post("/assets", json=asset_data, headers=auth_headers)
+    
+    first = client.get("/assets?sort=name&limit=3", headers=auth_headers)
+    assert first.status_code == status.HTTP_200_OK
+    assert [a["name"] for a in first.json()] == ["Alpha", "Bravo", "Charlie"]
+    
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/assets?sort=name&limit=3&cursor={cursor}", headers=auth_headers)
+    assert [a["name"] for a in second.json()] == ["Delta", "Echo"]
+    assert "X-Next-Cursor" not in second.headers
+    
+    # A cursor issued for one ordering cannot be replayed against another
+    response = client.get(f"/assets?sort=-name&cursor={cursor}", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_assets_invalid_sort(client, auth_headers):
+    """Test that unsupported sort fields are rejected"""
+    response = client.get("/assets?sort=serial_number", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -169,3 +169,60 @@ def test_protected_endpoints_with_auth(client):
     }
     response = client.post("/assets", json=asset_data, headers=headers)
     assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_principal_cached_after_first_request(client, auth_headers, test_user):
+    """Test that the authenticated principal is cached and later requests skip the user query"""
+    from sqlalchemy import event
+    from app.cache import get_cache
+    from app.crud.users import principal_cache_key
+    from tests.conftest import async_engine
+    
+    response = client.get("/assets", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert get_cache(principal_cache_key(test_user.id)) == {
+        "id": str(test_user.id),
+        "is_active": True,
+        "is_superuser": False
+    }
+    
+    checkouts = []
+    
+    def listener(*args):
+        checkouts.append(1)
+    
+    event.listen(async_engine.sync_engine, "checkout", listener)
+    try:
+        response = client.get("/assets", headers=auth_headers)
+    finally:
+        event.remove(async_engine.sync_engine, "checkout", listener)
+    assert response.status_code == status.HTTP_200_OK
+    assert checkouts == []
+
+
+def test_deactivated_user_rejected_immediately(client, auth_headers, test_user, db_session):
+    """Test that deactivating a user invalidates their cached principal"""
+    from app.crud.users import set_user_active
+    
+    response = client.get("/assets", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    
+    set_user_active(db_session, test_user.id, False)
+    
+    response = client.get("/assets", headers=auth_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.json()["detail"] == "User account is inactive"
+
+
+def test_login_returns_503_when_password_pool_saturated(client, test_user):
+    """Test that login fails fast instead of queueing behind a saturated hashing pool"""
+    from app.services.passwords import PasswordHasher
+    
+    saturated = PasswordHasher(workers=1, max_pending=0)
+    with patch('app.api.routes.auth.password_hasher', saturated):
+        response = client.post("/auth/login", data={
+            "username": "testuser@example.com",
+            "password": "testpassword123"
+        })
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,165 @@
+import pytest
+from fastapi import status
+
+
+def make_asset(i: int, **overrides) -> dict:
+    asset = {
+        "name": f"Bulk Asset {i}",
+        "asset_type": "laptop",
+        "serial_number": f"SN_BULK_{i:03d}",
+        "status": "active"
+    }
+    asset.update(overrides)
+    return asset
+
+
+def test_bulk_create_assets(client, auth_headers):
+    """Test creating many assets in one request"""
+    items = [make_asset(i) for i in range(10)]
+    response = client.post("/assets/bulk", json={"items": items}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["errors"] == []
+    assert [a["serial_number"] for a in data["created"]] == [i["serial_number"] for i in items]
+    assert all("id" in a and "created_at" in a for a in data["created"])
+
+
+def test_bulk_create_reports_duplicates_per_item(client, auth_headers):
+    """Test that duplicate serials fail individually instead of failing the batch"""
+    client.post("/assets", json=make_asset(1), headers=auth_headers)
+    
+    items = [make_asset(1), make_asset(2), make_asset(2, name="Again")]
+    response = client.post("/assets/bulk", json={"items": items}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [a["serial_number"] for a in data["created"]] == ["SN_BULK_002"]
+    assert [(e["index"], e["serial_number"]) for e in data["errors"]] == [(0, "SN_BULK_001"), (2, "SN_BULK_002")]
+
+
+def test_bulk_create_invalidates_list_cache(client, auth_headers):
+    """Test that the list cache reflects a bulk insert"""
+    client.get("/assets", headers=auth_headers)
+    
+    client.post("/assets/bulk", json={"items": [make_asset(i) for i in range(3)]}, headers=auth_headers)
+    
+    response = client.get("/assets", headers=auth_headers)
+    assert len(response.json()) == 3
+
+
+def test_bulk_create_rejects_oversized_batch(client, auth_headers):
+    """Test that batches above the configured limit are rejected"""
+    from app.config import settings
+    items = [make_asset(i) for i in range(settings.bulk_max_items + 1)]
+    response = client.post("/assets/bulk", json={"items": items}, headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+
+def test_bulk_update_by_ids(client, auth_headers):
+    """Test updating a set of assets by id"""
+    created = client.post("/assets/bulk", json={"items": [make_asset(i) for i in range(3)]}, headers=auth_headers).json()["created"]
+    ids = [a["id"] for a in created[:2]]
+    
+    response = client.patch(
+        "/assets/bulk",
+        json={"ids": ids, "changes": {"assigned_to": "Finance"}},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["count"] == 2
+    assert set(data["ids"]) == set(ids)
+    
+    assets = client.get("/assets?assigned_to=Finance", headers=auth_headers).json()
+    assert {a["id"] for a in assets} == set(ids)
+
+
+def test_bulk_update_by_filter(client, auth_headers):
+    """Test updating every asset that matches a filter"""
+    items = [make_asset(0, asset_type="monitor"), make_asset(1), make_asset(2)]
+    client.post("/assets/bulk", json={"items": items}, headers=auth_headers)
+    
+    response = client.patch(
+        "/assets/bulk",
+        json={"filter": {"asset_type": "laptop"}, "changes": {"status": "retired"}},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["count"] == 2
+    
+    retired = client.get("/assets?status=retired", headers=auth_headers).json()
+    assert {a["serial_number"] for a in retired} == {"SN_BULK_001", "SN_BULK_002"}
+
+
+def test_bulk_delete_by_ids(client, auth_headers):
+    """Test deleting a set of assets by id"""
+    created = client.post("/assets/bulk", json={"items": [make_asset(i) for i in range(3)]}, headers=auth_headers).json()["created"]
+    ids = [a["id"] for a in created[:2]]
+    
+    response = client.request("DELETE", "/assets/bulk", json={"ids": ids}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["count"] == 2
+    
+    for asset_id in ids:
+        assert client.get(f"/assets/{asset_id}", headers=auth_headers).status_code == status.HTTP_404_NOT_FOUND
+    assert len(client.get("/assets", headers=auth_headers).json()) == 1
+
+
+def test_bulk_selection_validation(client, auth_headers):
+    """Test that bulk requests need exactly one non-empty selection"""
+    response = client.request("DELETE", "/assets/bulk", json={"filter": {}}, headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    response = client.request("DELETE", "/assets/bulk", json={}, headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    response = client.patch("/assets/bulk", json={"filter": {"status": "active"}, "changes": {}}, headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_bulk_update_rejects_null_required_fields(client, auth_headers):
+    """Test that bulk changes cannot clear NOT NULL columns"""
+    for field in ("name", "asset_type", "status"):
+        response = client.patch(
+            "/assets/bulk",
+            json={"filter": {"status": "active"}, "changes": {field: None}},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    response = client.patch(
+        "/assets/bulk",
+        json={"filter": {"status": "active"}, "changes": {"assigned_to": None}},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_bulk_filter_over_limit_is_rejected(client, auth_headers, monkeypatch):
+    """Test that a filter matching more rows than the bulk limit changes nothing"""
+    from app.config import settings
+    monkeypatch.setattr(settings, "bulk_max_items", 2)
+    client.post("/assets/bulk", json={"items": [make_asset(i) for i in range(3)]}, headers=auth_headers)
+    
+    response = client.request("DELETE", "/assets/bulk", json={"filter": {"asset_type": "laptop"}}, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert len(client.get("/assets", headers=auth_headers).json()) == 3
+
+
+def test_bulk_update_above_threshold_bumps_asset_namespace(client, auth_headers, monkeypatch):
+    """Test that large bulk writes invalidate cached assets by bumping their namespace"""
+    from app.config import settings
+    from app.cache import namespace_generation
+    monkeypatch.setattr(settings, "cache_bump_threshold", 1)
+    created = client.post("/assets/bulk", json={"items": [make_asset(i) for i in range(2)]}, headers=auth_headers).json()["created"]
+    client.get(f"/assets/{created[0]['id']}", headers=auth_headers)
+    generation = namespace_generation("assets")
+    
+    response = client.patch(
+        "/assets/bulk",
+        json={"filter": {"asset_type": "laptop"}, "changes": {"assigned_to": "Ops"}},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert namespace_generation("assets") == generation + 1
+    assert client.get(f"/assets/{created[0]['id']}", headers=auth_headers).json()["assigned_to"] == "Ops"
@@ -1,7 +1,8 @@
 import pytest
 import time
+import uuid
 from fastapi import status
-from app.cache import get_cache, set_cache, delete_cache, cache_key
+from app.cache import get_cache, set_cache, delete_cache, cache_key, namespace_key, bump_namespace
 
 
 def test_cache_set_get(client, auth_headers):
@@ -139,11 +140,373 @@ def test_cache_ttl(client, auth_headers):
     assert response1.status_code == status.HTTP_200_OK
     count1 = len(response1.json())
     
-    from app.cache import delete_cache, cache_key
-    delete_cache(cache_key("assets:list", skip=0, limit=100))
+    bump_namespace("assets:list")
     
     response2 = client.get("/assets", headers=auth_headers)
     assert response2.status_code == status.HTTP_200_OK
     count2 = len(response2.json())
     
     assert count1 == count2  # Same data, but from database this time
+
+
+def test_get_asset_read_through_cache(client, auth_headers):
+    """Test that single-asset reads are cached and invalidated on update"""
+    asset_data = {
+        "name": "Cached Asset",
+        "asset_type": "laptop",
+        "serial_number": "SN_CACHE_007",
+        "status": "active"
+    }
+    asset_id = client.post("/assets", json=asset_data, headers=auth_headers).json()["id"]
+    key = namespace_key("assets", asset_id=asset_id)
+    delete_cache(key)
+    
+    response = client.get(f"/assets/{asset_id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert get_cache(key)["name"] == "Cached Asset"
+    
+    client.put(f"/assets/{asset_id}", json={"name": "Renamed"}, headers=auth_headers)
+    assert get_cache(key) is None
+    
+    response = client.get(f"/assets/{asset_id}", headers=auth_headers)
+    assert response.json()["name"] == "Renamed"
+
+
+def test_get_asset_caches_not_found(client, auth_headers):
+    """Test that lookups of unknown ids are negatively cached"""
+    from uuid import uuid4
+    fake_id = str(uuid4())
+    key = namespace_key("assets", asset_id=fake_id)
+    
+    response = client.get(f"/assets/{fake_id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert get_cache(key) == {"__missing__": True}
+    
+    response = client.get(f"/assets/{fake_id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_bump_namespace_changes_keys(client):
+    """Test that bumping a namespace generation orphans its old keys"""
+    old_key = namespace_key("test:ns", page=1)
+    set_cache(old_key, {"value": 1}, ttl=60)
+    assert get_cache(old_key) == {"value": 1}
+    
+    bump_namespace("test:ns")
+    new_key = namespace_key("test:ns", page=1)
+    assert new_key != old_key
+    assert get_cache(new_key) is None
+
+
+def test_local_cache_serves_hits_without_redis(client):
+    """Test that a cached value is answered from the in-process tier"""
+    from app.cache import local_cache, redis_client
+    
+    key = cache_key("test:local", item=1)
+    set_cache(key, {"value": 1}, ttl=60)
+    redis_client.delete(key)  # bypass invalidation: only the local tier still holds it
+    assert get_cache(key) == {"value": 1}
+    
+    delete_cache(key)
+    assert local_cache.get(key) is None
+    assert get_cache(key) is None
+
+
+def test_local_cache_invalidated_by_pubsub(client):
+    """Test that invalidations published by another worker evict local copies"""
+    from app.cache import local_cache, redis_client
+    from app.config import settings
+    
+    key = cache_key("test:pubsub", item=1)
+    local_cache.set(key, b'{"value": 1}')
+    redis_client.publish(settings.cache_invalidation_channel, key)
+    
+    deadline = time.time() + 3
+    while local_cache.get(key) is not None and time.time() < deadline:
+        time.sleep(0.05)
+    assert local_cache.get(key) is None
+
+
+def test_local_cache_bypassed_without_listener(client):
+    """Test that no local copies are kept while invalidations cannot be received"""
+    from app.cache import local_cache, redis_client, start_invalidation_listener, stop_invalidation_listener
+    
+    key = cache_key("test:nolistener", item=1)
+    stop_invalidation_listener()
+    try:
+        set_cache(key, {"value": 1}, ttl=60)
+        assert local_cache.get(key) is None
+        redis_client.delete(key)
+        assert get_cache(key) is None
+    finally:
+        start_invalidation_listener()
+
+def test_local_cache_memory_ceiling():
+    """Test that the local tier evicts least recently used entries past its byte ceiling"""
+    from app.cache import LocalCache
+    
+    cache = LocalCache(max_bytes=2000, ttl=60)
+    for i in range(20):
+        cache.set(f"key:{i}", b"x" * 200)
+    assert cache.size <= 2000
+    assert cache.evictions > 0
+    assert cache.get("key:0") is None
+    assert cache.get("key:19") == b"x" * 200
+
+
+def test_cache_stats_endpoint(client):
+    """Test that per-tier hit ratios are reported"""
+    response = client.get("/cache/stats")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    for field in ("local_hits", "redis_hits", "misses", "local_hit_ratio", "local_bytes", "local_max_bytes"):
+        assert field in data
+
+
+def test_get_or_set_serves_stale_while_refreshing(client):
+    """Test that an expired-but-not-dead value is returned while another caller holds the refresh lock"""
+    from app.cache import get_or_set, redis_client
+    
+    key = cache_key("test:swr", page=1)
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        return {"version": len(calls)}
+    
+    assert get_or_set(key, loader, ttl=1, stale_ttl=60) == {"version": 1}
+    assert get_or_set(key, loader, ttl=1, stale_ttl=60) == {"version": 1}
+    assert len(calls) == 1
+    
+    time.sleep(1.1)
+    # Another worker is already refreshing: we get the stale value immediately
+    redis_client.set(f"lock:{key}", "someone-else", px=5000)
+    assert get_or_set(key, loader, ttl=1, stale_ttl=60) == {"version": 1}
+    assert len(calls) == 1
+    
+    # Lock released: the next caller still gets the stale value at once and
+    # refreshes it in the background
+    redis_client.delete(f"lock:{key}")
+    assert get_or_set(key, loader, ttl=1, stale_ttl=60) == {"version": 1}
+    deadline = time.time() + 5
+    while get_or_set(key, loader, ttl=60, stale_ttl=60) != {"version": 2} and time.time() < deadline:
+        time.sleep(0.02)
+    assert get_or_set(key, loader, ttl=60, stale_ttl=60) == {"version": 2}
+    assert len(calls) == 2
+    delete_cache(key)
+
+
+def test_get_or_set_prefers_redis_over_stale_local_copy(client):
+    """Test that a stale local copy does not trigger a refresh another worker already stored"""
+    from app.cache import get_or_set_raw, local_cache, redis_client
+    
+    key = cache_key("test:swr-local", page=1)
+    redis_client.setex(key, 60, b"%f\nfresh" % (time.time() + 60))
+    local_cache.set(key, b"%f\nstale" % (time.time() - 1))
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        return b"rebuilt"
+    
+    assert get_or_set_raw(key, loader, ttl=60, stale_ttl=60) == b"fresh"
+    assert calls == []
+    delete_cache(key)
+
+
+def test_get_or_set_single_flight(client):
+    """Test that concurrent misses run the loader once"""
+    import threading
+    from app.cache import get_or_set
+    
+    key = cache_key("test:singleflight", page=1)
+    delete_cache(key)
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 42}
+    
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(get_or_set(key, loader, ttl=60)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == [{"value": 42}] * 5
+    assert len(calls) == 1
+    delete_cache(key)
+
+
+def test_get_or_set_computes_at_once_when_redis_is_down():
+    """Test that a Redis outage falls straight through to the loader instead of waiting on the lock"""
+    import redis
+    from unittest.mock import patch
+    from app.cache import get_or_set_raw
+    
+    unreachable = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1)
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        return b"page"
+    
+    with patch("app.cache.redis_client", unreachable):
+        started = time.monotonic()
+        assert get_or_set_raw(cache_key("test:outage", page=1), loader, ttl=60) == b"page"
+        elapsed = time.monotonic() - started
+    assert calls == [1]
+    assert elapsed < 0.2
+
+
+def test_list_cache_hit_returns_identical_body(client, auth_headers):
+    """Test that a cached list page is served byte-for-byte with its cursor header"""
+    for i in range(3):
+        client.post("/assets", json={
+            "name": f"Raw {i}",
+            "asset_type": "laptop",
+            "serial_number": f"SN_RAW_{i:03d}"
+        }, headers=auth_headers)
+    
+    miss = client.get("/assets?limit=2", headers=auth_headers)
+    hit = client.get("/assets?limit=2", headers=auth_headers)
+    assert miss.status_code == status.HTTP_200_OK
+    assert hit.status_code == status.HTTP_200_OK
+    assert hit.content == miss.content
+    assert hit.headers["content-type"] == "application/json"
+    assert hit.headers["X-Next-Cursor"] == miss.headers["X-Next-Cursor"]
+    assert len(hit.json()) == 2
+
+
+def test_set_many_and_get_many(client):
+    """Test that batch writes and reads round-trip and skip missing keys"""
+    from app.cache import set_many, get_many, delete_many
+    
+    keys = [cache_key("test:batch", item=i) for i in range(3)]
+    assert set_many({key: {"value": i} for i, key in enumerate(keys)}, ttl=60)
+    
+    found = get_many(keys + [cache_key("test:batch", item="absent")])
+    assert found == {key: {"value": i} for i, key in enumerate(keys)}
+    
+    delete_many(keys)
+    assert get_many(keys) == {}
+
+
+def test_delete_many_bumps_namespaces(client):
+    """Test that keys and namespace generations are invalidated together"""
+    from app.cache import delete_many, namespace_generation
+    
+    key = cache_key("test:batchdelete", item=1)
+    set_cache(key, {"value": 1}, ttl=60)
+    before = namespace_generation("test:batchns")
+    
+    assert delete_many([key], bump=["test:batchns"])
+    assert get_cache(key) is None
+    assert namespace_generation("test:batchns") == before + 1
+
+
+async def test_async_batch_operations():
+    """Test the async client's batch API"""
+    from app.cache import set_many_async, get_many_async, get_cache_async, delete_many_async, close_async_redis
+    
+    keys = [cache_key("test:asyncbatch", item=i) for i in range(3)]
+    try:
+        assert await set_many_async({key: {"value": i} for i, key in enumerate(keys)}, ttl=60)
+        assert await get_cache_async(keys[0]) == {"value": 0}
+        assert len(await get_many_async(keys)) == 3
+        assert await delete_many_async(keys)
+        assert await get_many_async(keys) == {}
+    finally:
+        await close_async_redis()
+
+
+async def test_fenced_set_skipped_after_invalidation():
+    """Test that a reader cannot write back a value invalidated while it was loading"""
+    from app.cache import read_fence_async, set_fenced_async, get_cache_async, delete_many_async, close_async_redis
+    
+    key = cache_key("test:fence", item=1)
+    try:
+        fence = await read_fence_async(key)
+        # A concurrent write commits and invalidates while the reader is in the database
+        assert await delete_many_async([key], fence=True)
+        assert not await set_fenced_async(key, {"version": 1}, 60, fence)
+        assert await get_cache_async(key) is None
+        
+        fence = await read_fence_async(key)
+        assert await set_fenced_async(key, {"version": 2}, 60, fence)
+        assert await get_cache_async(key) == {"version": 2}
+        await delete_many_async([key])
+    finally:
+        await close_async_redis()
+
+def test_metrics_endpoint_reports_cache_prefixes(client, auth_headers):
+    """Test that cache hits, misses and latency are exported per key prefix"""
+    client.get("/assets", headers=auth_headers)
+    client.get("/assets", headers=auth_headers)
+    client.get(f"/assets/{uuid.uuid4()}", headers=auth_headers)
+    
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'cache_hits_total{prefix="assets:list"' in body
+    assert 'cache_misses_total{prefix="assets:asset_id"}' in body
+    assert 'cache_operation_seconds_bucket{' in body
+    assert "cache_local_bytes" in body
+
+
+def test_namespace_bump_keeps_metric_prefix(client, auth_headers):
+    """Test that bumping a namespace does not start a new per-generation metric series"""
+    client.get(f"/assets/{uuid.uuid4()}", headers=auth_headers)
+    bump_namespace("assets")
+    client.get(f"/assets/{uuid.uuid4()}", headers=auth_headers)
+    
+    body = client.get("/metrics").text
+    assert 'cache_misses_total{prefix="assets:asset_id"}' in body
+    assert 'prefix="assets:v' not in body
+
+def test_cache_hit_checks_out_no_connection(client, auth_headers, monkeypatch):
+    """Test that list and single-asset cache hits never check out a database connection"""
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.api.routes import assets as asset_routes
+    from tests.conftest import SQLALCHEMY_TEST_DATABASE_URL, async_engine
+    
+    response = client.post("/assets", json={
+        "name": "Pool Asset",
+        "asset_type": "laptop",
+        "serial_number": "SN_POOL_001"
+    }, headers=auth_headers)
+    asset_id = response.json()["id"]
+    
+    # List pages are loaded through their own session; point it at a throwaway
+    # engine whose checkouts the test can see.
+    sync_engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
+    monkeypatch.setattr(asset_routes, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=sync_engine))
+    
+    checkouts = []
+    
+    def listener(*args):
+        checkouts.append(1)
+    
+    pools = [sync_engine, async_engine.sync_engine]
+    for pool_engine in pools:
+        event.listen(pool_engine, "checkout", listener)
+    try:
+        assert client.get("/assets", headers=auth_headers).status_code == status.HTTP_200_OK
+        assert client.get(f"/assets/{asset_id}", headers=auth_headers).status_code == status.HTTP_200_OK
+        assert checkouts
+        
+        checkouts.clear()
+        assert client.get("/assets", headers=auth_headers).status_code == status.HTTP_200_OK
+        assert client.get(f"/assets/{asset_id}", headers=auth_headers).status_code == status.HTTP_200_OK
+    finally:
+        for pool_engine in pools:
+            event.remove(pool_engine, "checkout", listener)
+        sync_engine.dispose()
+    assert checkouts == []
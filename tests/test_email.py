@@ -0,0 +1,133 @@
+import pytest
+import socket
+import time
+from aiosmtpd.controller import Controller
+from app.services.email import EmailDispatcher
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.fail_next = 0
+    
+    async def handle_DATA(self, server, session, envelope):
+        if self.fail_next:
+            self.fail_next -= 1
+            return "451 Try again later"
+        self.messages.append((session.peer, envelope))
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def make_dispatcher(controller, **kwargs):
+    return EmailDispatcher(
+        host=controller.hostname,
+        port=controller.port,
+        user=None,
+        password=None,
+        sender="alerts@example.com",
+        use_tls=False,
+        retry_backoff=0.01,
+        **kwargs
+    )
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_dispatcher_delivers_over_one_session(smtp_server):
+    """Test that queued messages are delivered and share a single SMTP connection"""
+    controller, handler = smtp_server
+    dispatcher = make_dispatcher(controller)
+    dispatcher.start()
+    try:
+        for i in range(5):
+            assert dispatcher.enqueue(f"user{i}@example.com", "Alert", f"Message {i}")
+        assert wait_for(lambda: len(handler.messages) == 5)
+    finally:
+        dispatcher.stop()
+    
+    assert {envelope.rcpt_tos[0] for _, envelope in handler.messages} == {
+        f"user{i}@example.com" for i in range(5)
+    }
+    assert len({peer for peer, _ in handler.messages}) == 1
+
+
+def test_dispatcher_retries_transient_failures(smtp_server):
+    """Test that a temporary SMTP failure is retried on a fresh connection"""
+    controller, handler = smtp_server
+    handler.fail_next = 2
+    dispatcher = make_dispatcher(controller, max_retries=3)
+    dispatcher.start()
+    try:
+        assert dispatcher.enqueue("retry@example.com", "Alert", "Body")
+        assert wait_for(lambda: len(handler.messages) == 1)
+    finally:
+        dispatcher.stop()
+
+
+def test_dispatcher_flushes_queue_on_stop(smtp_server):
+    """Test that messages queued before shutdown are still sent"""
+    controller, handler = smtp_server
+    dispatcher = make_dispatcher(controller)
+    for i in range(3):
+        dispatcher.enqueue(f"late{i}@example.com", "Alert", "Body")
+    assert dispatcher.depth == 3
+    
+    dispatcher.start()
+    dispatcher.stop()
+    assert len(handler.messages) == 3
+
+
+def test_enqueue_rejects_when_full(smtp_server):
+    """Test that a full queue drops new messages instead of blocking the caller"""
+    controller, _ = smtp_server
+    dispatcher = make_dispatcher(controller, max_queue=1)
+    assert dispatcher.enqueue("first@example.com", "Alert", "Body")
+    assert not dispatcher.enqueue("second@example.com", "Alert", "Body")
+
+
+def test_stop_returns_when_queue_is_full(smtp_server, monkeypatch):
+    """Test that stop gives up waiting for queue space and lets the worker exit after its batch"""
+    import threading
+    controller, _ = smtp_server
+    dispatcher = make_dispatcher(controller, max_queue=1, batch_size=1)
+    release = threading.Event()
+    sending = threading.Event()
+    
+    def blocked_send(batch):
+        sending.set()
+        release.wait(5)
+    
+    monkeypatch.setattr(dispatcher, "_send_batch", blocked_send)
+    dispatcher.start()
+    worker = dispatcher._thread
+    assert dispatcher.enqueue("first@example.com", "Alert", "Body")
+    assert sending.wait(5)
+    assert dispatcher.enqueue("second@example.com", "Alert", "Body")
+    
+    started = time.monotonic()
+    dispatcher.stop(timeout=0.2)
+    assert time.monotonic() - started < 1
+    
+    release.set()
+    worker.join(5)
+    assert not worker.is_alive()
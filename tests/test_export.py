@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+import pytest
+from fastapi import status
+
+
+def create_assets(client, auth_headers, count: int = 3):
+    items = [
+        {
+            "name": f"Export Asset {i}",
+            "asset_type": "laptop",
+            "serial_number": f"SN_EXPORT_{i:03d}",
+            "status": "active",
+            "purchase_price": 1000.5
+        }
+        for i in range(count)
+    ]
+    client.post("/assets/bulk", json={"items": items}, headers=auth_headers)
+
+
+def test_export_ndjson(client, auth_headers):
+    """Test exporting the inventory as NDJSON"""
+    create_assets(client, auth_headers)
+    
+    response = client.get("/assets/export?format=ndjson", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r["serial_number"] for r in records) == ["SN_EXPORT_000", "SN_EXPORT_001", "SN_EXPORT_002"]
+    assert records[0]["purchase_price"] == 1000.5
+    assert "search_vector" not in records[0]
+
+
+def test_export_csv(client, auth_headers):
+    """Test exporting the inventory as CSV"""
+    create_assets(client, auth_headers)
+    
+    response = client.get("/assets/export?format=csv", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert sorted(r["serial_number"] for r in rows) == ["SN_EXPORT_000", "SN_EXPORT_001", "SN_EXPORT_002"]
+    assert rows[0]["assigned_to"] == ""
+
+
+def test_export_invalid_format(client, auth_headers):
+    """Test that unknown export formats are rejected"""
+    response = client.get("/assets/export?format=xml", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,179 @@
+import json
+import pytest
+from fastapi import status
+
+
+def test_import_ndjson(client, auth_headers):
+    """Test importing assets from NDJSON"""
+    lines = [
+        json.dumps({"name": f"Import {i}", "asset_type": "laptop", "serial_number": f"SN_IMPORT_{i:03d}"})
+        for i in range(5)
+    ]
+    response = client.post(
+        "/assets/import",
+        content="\n".join(lines) + "\n",
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"inserted": 5, "updated": 0, "rejected": 0, "errors": []}
+    assert len(client.get("/assets", headers=auth_headers).json()) == 5
+
+
+def test_import_csv_upserts_on_serial(client, auth_headers):
+    """Test that CSV import updates assets whose serial already exists"""
+    client.post("/assets", json={
+        "name": "Old Name",
+        "asset_type": "laptop",
+        "serial_number": "SN_IMPORT_001",
+        "description": "Keep me"
+    }, headers=auth_headers)
+    
+    body = (
+        "name,asset_type,serial_number,status,description\n"
+        "New Name,laptop,SN_IMPORT_001,maintenance,\n"
+        "Fresh,monitor,SN_IMPORT_002,active,Brand new\n"
+    )
+    response = client.post(
+        "/assets/import",
+        content=body,
+        headers={**auth_headers, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (1, 1, 0)
+    
+    assets = {a["serial_number"]: a for a in client.get("/assets", headers=auth_headers).json()}
+    assert assets["SN_IMPORT_001"]["name"] == "New Name"
+    assert assets["SN_IMPORT_001"]["status"] == "maintenance"
+    assert assets["SN_IMPORT_001"]["description"] == "Keep me"
+
+
+def test_import_keeps_existing_status(client, auth_headers):
+    """Test that rows without a status do not reset an existing asset's status"""
+    for serial in ("SN_IMPORT_KEEP_1", "SN_IMPORT_KEEP_2"):
+        client.post("/assets", json={
+            "name": "Laptop",
+            "asset_type": "laptop",
+            "serial_number": serial,
+            "status": "maintenance"
+        }, headers=auth_headers)
+    
+    body = (
+        "name,asset_type,serial_number,status\n"
+        "Renamed,laptop,SN_IMPORT_KEEP_1,\n"
+    )
+    client.post("/assets/import", content=body, headers={**auth_headers, "Content-Type": "text/csv"})
+    line = json.dumps({"name": "Renamed", "asset_type": "laptop", "serial_number": "SN_IMPORT_KEEP_2"})
+    client.post("/assets/import", content=line + "\n", headers={**auth_headers, "Content-Type": "application/x-ndjson"})
+    
+    assets = {a["serial_number"]: a for a in client.get("/assets", headers=auth_headers).json()}
+    for serial in ("SN_IMPORT_KEEP_1", "SN_IMPORT_KEEP_2"):
+        assert assets[serial]["name"] == "Renamed"
+        assert assets[serial]["status"] == "maintenance"
+
+
+def test_import_reports_rejected_rows(client, auth_headers):
+    """Test that invalid rows are rejected with their line numbers"""
+    body = "\n".join([
+        json.dumps({"name": "Good", "asset_type": "laptop", "serial_number": "SN_IMPORT_010"}),
+        "{not json",
+        json.dumps({"name": "", "asset_type": "laptop", "serial_number": "SN_IMPORT_011"}),
+    ])
+    response = client.post(
+        "/assets/import?format=ndjson",
+        content=body,
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (1, 0, 2)
+    assert [e["line"] for e in data["errors"]] == [2, 3]
+
+
+def test_import_csv_multiline_fields_round_trip(client, auth_headers):
+    """Test that a CSV export with quoted multi-line fields imports back unchanged"""
+    description = 'Dented lid\nCharger "65W" missing\n\nSee ticket 42'
+    client.post("/assets", json={
+        "name": "Laptop",
+        "asset_type": "laptop",
+        "serial_number": "SN_IMPORT_MULTILINE",
+        "description": description
+    }, headers=auth_headers)
+    exported = client.get("/assets/export?format=csv", headers=auth_headers).text
+    client.patch("/assets/bulk", json={"filter": {"asset_type": "laptop"}, "changes": {"description": "overwritten"}}, headers=auth_headers)
+    
+    response = client.post(
+        "/assets/import",
+        content=exported,
+        headers={**auth_headers, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (0, 1, 0)
+    asset = client.get("/assets", headers=auth_headers).json()[0]
+    assert asset["description"] == description
+
+
+def test_import_invalid_utf8(client, auth_headers):
+    """Test that a body that is not UTF-8 is rejected with the failing line"""
+    body = json.dumps({"name": "Good", "asset_type": "laptop", "serial_number": "SN_IMPORT_UTF8"}).encode() + b"\n\xff\xfe\n"
+    response = client.post(
+        "/assets/import?format=ndjson",
+        content=body,
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Line 2" in response.json()["detail"]
+
+
+def test_import_csv_unterminated_quote_is_rejected(client, auth_headers):
+    """Test that an unterminated quoted field is rejected instead of swallowing the rows after it"""
+    response = client.post(
+        "/assets/import",
+        content='name,asset_type,serial_number\nA,laptop,"SN_IMPORT_Q1\nB,laptop,SN_IMPORT_Q2\n',
+        headers={**auth_headers, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (0, 0, 1)
+    assert data["errors"] == [{"line": 2, "detail": "Unterminated quoted field"}]
+
+
+def test_import_rejects_oversized_records(client, auth_headers, monkeypatch):
+    """Test that lines and quoted records above the size limit are rejected without stopping the import"""
+    from app.config import settings
+    monkeypatch.setattr(settings, "import_max_record_bytes", 100)
+    
+    body = "\n".join([
+        json.dumps({"name": "Small", "asset_type": "laptop", "serial_number": "SN_IMPORT_BIG1"}),
+        json.dumps({"name": "x" * 200, "asset_type": "laptop", "serial_number": "SN_IMPORT_BIG2"}),
+        json.dumps({"name": "Small", "asset_type": "laptop", "serial_number": "SN_IMPORT_BIG3"}),
+    ])
+    response = client.post("/assets/import?format=ndjson", content=body, headers=auth_headers)
+    data = response.json()
+    assert (data["inserted"], data["rejected"]) == (2, 1)
+    assert data["errors"][0]["line"] == 2
+    
+    body = 'name,asset_type,serial_number,description\nA,laptop,SN_IMPORT_BIG4,"' + "long\n" * 30 + '"\nB,laptop,SN_IMPORT_BIG5,\n'
+    response = client.post("/assets/import", content=body, headers={**auth_headers, "Content-Type": "text/csv"})
+    data = response.json()
+    assert (data["inserted"], data["rejected"]) == (1, 1)
+    assert data["errors"][0]["line"] == 2
+
+def test_import_commits_in_chunks(client, auth_headers, monkeypatch):
+    """Test importing more rows than fit in one chunk, including a repeated serial"""
+    from app.config import settings
+    monkeypatch.setattr(settings, "import_chunk_size", 2)
+    
+    lines = [
+        json.dumps({"name": f"Chunk {i}", "asset_type": "laptop", "serial_number": f"SN_CHUNK_{i % 4}"})
+        for i in range(5)
+    ]
+    response = client.post(
+        "/assets/import?format=ndjson",
+        content="\n".join(lines),
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (4, 1, 0)
@@ -0,0 +1,77 @@
+import pytest
+from fastapi import status
+
+
+def create_assets(client, auth_headers):
+    assets = [
+        {
+            "name": "MacBook Pro",
+            "asset_type": "laptop",
+            "serial_number": "SN_SEARCH_001",
+            "status": "active",
+            "description": "A silver laptop with a cracked screen and worn keyboard."
+        },
+        {
+            "name": "Dell Monitor",
+            "asset_type": "monitor",
+            "serial_number": "SN_SEARCH_002",
+            "status": "active",
+            "description": "A 27 inch monitor in excellent condition."
+        }
+    ]
+    for asset in assets:
+        client.post("/assets", json=asset, headers=auth_headers)
+
+
+def test_search_description(client, auth_headers):
+    """Test searching the AI-generated description"""
+    create_assets(client, auth_headers)
+    
+    response = client.get("/assets/search?q=cracked screen", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()
+    assert [r["serial_number"] for r in results] == ["SN_SEARCH_001"]
+    assert results[0]["rank"] > 0
+    assert "<b>cracked</b>" in results[0]["snippet"]
+
+
+
+def test_search_snippet_escapes_markup(client, auth_headers):
+    """Test that markup in a description is escaped in the highlighted snippet"""
+    client.post("/assets", json={
+        "name": "Kiosk",
+        "asset_type": "tablet",
+        "serial_number": "SN_SEARCH_XSS",
+        "description": "<img src=x onerror=alert(1)> tablet with a cracked bezel"
+    }, headers=auth_headers)
+    
+    response = client.get("/assets/search?q=cracked", headers=auth_headers)
+    snippet = response.json()[0]["snippet"]
+    assert "<img" not in snippet
+    assert "<b>cracked</b>" in snippet
+
+def test_search_serial_number(client, auth_headers):
+    """Test searching by serial number"""
+    create_assets(client, auth_headers)
+    
+    response = client.get("/assets/search?q=SN_SEARCH_002", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [r["serial_number"] for r in response.json()] == ["SN_SEARCH_002"]
+
+
+def test_search_reflects_updates(client, auth_headers):
+    """Test that the search index follows writes"""
+    create_assets(client, auth_headers)
+    
+    response = client.get("/assets/search?q=monitor", headers=auth_headers)
+    asset_id = response.json()[0]["id"]
+    client.put(f"/assets/{asset_id}", json={"description": "Display with dead pixels"}, headers=auth_headers)
+    
+    response = client.get("/assets/search?q=pixels", headers=auth_headers)
+    assert [r["id"] for r in response.json()] == [asset_id]
+
+
+def test_search_requires_query(client, auth_headers):
+    """Test that an empty query is rejected"""
+    response = client.get("/assets/search?q=", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
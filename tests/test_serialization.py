@@ -0,0 +1,69 @@
+import pytest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+from fastapi import status
+from app.serialization import CODECS, get_codec
+
+
+def sample_value():
+    return {
+        "id": uuid4(),
+        "purchase_date": date(2024, 3, 1),
+        "created_at": datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc),
+        "purchase_price": Decimal("1299.99"),
+        "tags": ["a", "b"],
+        "assigned_to": None,
+    }
+
+
+def test_msgpack_round_trips_rich_types():
+    """Test that msgpack restores UUID, date, datetime and Decimal values unchanged"""
+    value = sample_value()
+    codec = get_codec("msgpack")
+    assert codec.loads(codec.dumps(value)) == value
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+def test_json_codecs_encode_rich_types(name):
+    """Test that JSON codecs write UUIDs and dates as strings and Decimals as numbers"""
+    value = sample_value()
+    codec = get_codec(name)
+    decoded = codec.loads(codec.dumps(value))
+    assert decoded["id"] == str(value["id"])
+    assert decoded["purchase_date"] == "2024-03-01"
+    assert decoded["created_at"].startswith("2024-03-01T12:30:00")
+    assert decoded["purchase_price"] == 1299.99
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_codecs_reject_unknown_types(name):
+    """Test that every codec refuses values it cannot represent"""
+    with pytest.raises(TypeError):
+        get_codec(name).dumps({"value": object()})
+
+
+def test_unknown_codec():
+    """Test that an unknown codec name is reported"""
+    with pytest.raises(ValueError):
+        get_codec("pickle")
+
+
+def test_get_asset_response_encoding(client, auth_headers):
+    """Test that responses keep the same JSON shape with the configured response codec"""
+    response = client.post("/assets", json={
+        "name": "Codec Asset",
+        "asset_type": "laptop",
+        "serial_number": "SN_CODEC_001",
+        "purchase_date": "2024-03-01",
+        "purchase_price": 1299.99
+    }, headers=auth_headers)
+    asset_id = response.json()["id"]
+    
+    for _ in range(2):  # miss, then cache hit
+        response = client.get(f"/assets/{asset_id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["purchase_date"] == "2024-03-01"
+        assert data["purchase_price"] == 1299.99